@@ -1,36 +1,15 @@
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import pandas as pd
 import time
 import os
-import json
+from functools import lru_cache
 
-LOG_PREFIX = "[bitget_data]"
+from exchange_factory import get_shared_session, json_dumps, json_loads
+from utils import VERBOSE_LOGS
 
-# Create a session with retry strategy and connection pooling
-def _create_session():
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=5,  # Total retry attempts
-        backoff_factor=1,  # Wait 1s, 2s, 4s, 8s, 16s between retries
-        status_forcelist=[429, 500, 502, 503, 504],  # Retry on these status codes
-        allowed_methods=["GET"],  # Only retry GET requests
-        raise_on_status=False
-    )
-    adapter = HTTPAdapter(
-        max_retries=retry_strategy,
-        pool_connections=10,
-        pool_maxsize=20,
-        pool_block=False
-    )
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    # Set reasonable timeouts
-    session.timeout = (10, 30)  # (connect timeout, read timeout)
-    return session
+LOG_PREFIX = "[bitget_data]"
 
-_SESSION = _create_session()
+# Connections are pooled in one session shared with the other exchanges
+_SESSION = get_shared_session()
 
 _PAIRS_CACHE = None
 CACHE_FILE = os.path.join(os.path.dirname(__file__), 'bitget_pairs_cache.json')
@@ -41,8 +20,8 @@ BITGET_BASE_URL = 'https://api.bitget.com'  # Bitget API
 def _load_pairs_from_disk():
     try:
         if os.path.exists(CACHE_FILE):
-            with open(CACHE_FILE, 'r') as f:
-                data = json.load(f)
+            with open(CACHE_FILE, 'rb') as f:
+                data = json_loads(f.read())
                 if isinstance(data, dict) and 'pairs' in data and 'timestamp' in data:
                     current_time = time.time()
                     if current_time - data['timestamp'] < CACHE_EXPIRY:
@@ -73,7 +52,7 @@ def get_all_pairs(force_refresh=False):
         params = {'productType': 'USDT-FUTURES'}  # Changed from umcbl to USDT-FUTURES
         resp = _SESSION.get(url, params=params, timeout=(10, 30))
         resp.raise_for_status()
-        data = resp.json()
+        data = json_loads(resp.content)
         
         if data.get('code') != '00000':
             print(f"{LOG_PREFIX} ⚠️ API error: {data.get('msg', 'Unknown error')}")
@@ -101,8 +80,8 @@ def get_all_pairs(force_refresh=False):
                 'pairs': pairs,
                 'timestamp': time.time()
             }
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(cache_data, f)
+            with open(CACHE_FILE, 'wb') as f:
+                f.write(json_dumps(cache_data))
             print(f"{LOG_PREFIX} 💾 Saved pairs to disk cache")
         except Exception as e:
             print(f"{LOG_PREFIX} ❌ Error saving cache to disk: {e}")
@@ -112,9 +91,13 @@ def get_all_pairs(force_refresh=False):
     print(f"{LOG_PREFIX} ⚠️ No pairs fetched, using fallback cache")
     return _PAIRS_CACHE
 
+# Separators dropped from user input in one translate pass
+_SYMBOL_STRIP_TABLE = str.maketrans('', '', '-/_')
+
+@lru_cache(maxsize=4096)
 def normalize_symbol(symbol: str) -> str:
     """Normalize symbol to Bitget format (BTCUSDT)"""
-    s = (symbol or '').strip().upper().replace('-', '').replace('/', '').replace('_', '')
+    s = (symbol or '').strip().upper().translate(_SYMBOL_STRIP_TABLE)
     if not s.endswith('USDT'):
         s = s + 'USDT'
     return s
@@ -210,22 +193,25 @@ def fetch_ohlc(symbol: str, timeframe: str, limit: int = 500):
         'endTime': str(current_time)     # NEWEST timestamp (end of range)
     }
     
-    print(f"{LOG_PREFIX} 🔍 DEBUG - Request parameters:")
-    print(f"{LOG_PREFIX}   - current_time (newest): {current_time}")
-    print(f"{LOG_PREFIX}   - oldest_time: {oldest_time}")
-    print(f"{LOG_PREFIX}   - duration_ms: {duration_ms}")
-    print(f"{LOG_PREFIX}   - interval: {interval}")
-    print(f"{LOG_PREFIX}   - limit: {limit}")
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} 🔍 DEBUG - Request parameters:")
+        print(f"{LOG_PREFIX}   - current_time (newest): {current_time}")
+        print(f"{LOG_PREFIX}   - oldest_time: {oldest_time}")
+        print(f"{LOG_PREFIX}   - duration_ms: {duration_ms}")
+        print(f"{LOG_PREFIX}   - interval: {interval}")
+        print(f"{LOG_PREFIX}   - limit: {limit}")
     
     try:
         resp = _SESSION.get(url, params=params, timeout=(10, 30))
         
-        # Print response before raising error
-        print(f"{LOG_PREFIX} 📥 Response status: {resp.status_code}")
-        print(f"{LOG_PREFIX} 📥 Response body: {resp.text[:500]}")  # First 500 chars
+        # Only dump the response when Bitget rejects the request; decoding the
+        # body text on every successful fetch is wasted work
+        if not resp.ok:
+            print(f"{LOG_PREFIX} 📥 Response status: {resp.status_code} for {params}")
+            print(f"{LOG_PREFIX} 📥 Response body: {resp.text[:500]}")  # First 500 chars
         
         resp.raise_for_status()
-        data = resp.json()
+        data = json_loads(resp.content)
         
         if data.get('code') != '00000':
             print(f"{LOG_PREFIX} ❌ API error code: {data.get('code')}")
@@ -283,7 +269,7 @@ def get_last_price_from_rest(symbol: str):
         }
         resp = _SESSION.get(url, params=params, timeout=(10, 30))
         resp.raise_for_status()
-        data = resp.json()
+        data = json_loads(resp.content)
         
         if data.get('code') != '00000':
             print(f"{LOG_PREFIX} ❌ API error: {data.get('msg', 'Unknown error')}")
@@ -1,36 +1,15 @@
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import pandas as pd
 import time
 import os
-import json
+from functools import lru_cache
 
-LOG_PREFIX = "[bybit_data]"
+from exchange_factory import get_shared_session, json_dumps, json_loads
 
-# Create a session with retry strategy and connection pooling
-def _create_session():
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=5,  # Total retry attempts
-        backoff_factor=1,  # Wait 1s, 2s, 4s, 8s, 16s between retries
-        status_forcelist=[429, 500, 502, 503, 504],  # Retry on these status codes
-        allowed_methods=["GET"],  # Only retry GET requests
-        raise_on_status=False
-    )
-    adapter = HTTPAdapter(
-        max_retries=retry_strategy,
-        pool_connections=10,
-        pool_maxsize=20,
-        pool_block=False
-    )
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    # Set reasonable timeouts
-    session.timeout = (10, 30)  # (connect timeout, read timeout)
-    return session
+LOG_PREFIX = "[bybit_data]"
 
-_SESSION = _create_session()
+# Connections are pooled in one session shared with the other exchanges
+_SESSION = get_shared_session()
 
 _PAIRS_CACHE = None
 CACHE_FILE = os.path.join(os.path.dirname(__file__), 'bybit_pairs_cache.json')
@@ -44,8 +23,8 @@ BYBIT_URLS = [
 def _load_pairs_from_disk():
     try:
         if os.path.exists(CACHE_FILE):
-            with open(CACHE_FILE, 'r') as f:
-                data = json.load(f)
+            with open(CACHE_FILE, 'rb') as f:
+                data = json_loads(f.read())
                 if isinstance(data, dict) and 'pairs' in data and 'timestamp' in data:
                     current_time = time.time()
                     if current_time - data['timestamp'] < CACHE_EXPIRY:
@@ -86,7 +65,7 @@ def get_all_pairs(force_refresh=False):
             try:
                 resp = _SESSION.get(url, params=params, timeout=(10, 30))  # 10s connect, 30s read
                 resp.raise_for_status()  # Raise exception for bad status codes
-                data = resp.json()
+                data = json_loads(resp.content)
 
                 if data.get('retCode') != 0:
                     print(f"{LOG_PREFIX} ⚠️ API error from {url}: {data.get('retMsg', 'Unknown error')}")
@@ -131,8 +110,8 @@ def get_all_pairs(force_refresh=False):
                 'pairs': pairs,
                 'timestamp': time.time()
             }
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(cache_data, f)
+            with open(CACHE_FILE, 'wb') as f:
+                f.write(json_dumps(cache_data))
             print(f"{LOG_PREFIX} 💾 Saved pairs to disk cache")
         except Exception as e:
             print(f"{LOG_PREFIX} ❌ Error saving cache to disk: {e}")
@@ -141,8 +120,12 @@ def get_all_pairs(force_refresh=False):
     print(f"{LOG_PREFIX} ⚠️ No pairs fetched, using fallback cache")
     return _PAIRS_CACHE
 
+# Separators dropped from user input in one translate pass
+_SYMBOL_STRIP_TABLE = str.maketrans('', '', '-/')
+
+@lru_cache(maxsize=4096)
 def normalize_symbol(symbol: str) -> str:
-    s = (symbol or '').strip().upper().replace('-', '').replace('/', '')
+    s = (symbol or '').strip().upper().translate(_SYMBOL_STRIP_TABLE)
     if not s.endswith('USDT'):
         s = s + 'USDT'
     return s
@@ -199,7 +182,7 @@ def fetch_ohlc(symbol: str, timeframe: str, limit: int = 500):
                 url = f"https://{domain}/v5/market/kline?category=linear&symbol={symbol}&interval={interval}&limit={limit}"
                 resp = _SESSION.get(url, timeout=(15, 45))  # Longer timeout for OHLC data
                 resp.raise_for_status()
-                data = resp.json()
+                data = json_loads(resp.content)
                 result = data.get('result', {}) or {}
                 ohlc_list = result.get('list', []) or []
                 if isinstance(ohlc_list, list) and len(ohlc_list) > 0:
@@ -242,7 +225,7 @@ def get_last_price_from_rest(symbol: str):
                 url = f"https://{domain}/v5/market/tickers?category=linear&symbol={symbol}"
                 resp = _SESSION.get(url, timeout=(8, 15))  # 8s connect, 15s read
                 resp.raise_for_status()
-                data = resp.json()
+                data = json_loads(resp.content)
                 if data.get('retCode') != 0:
                     print(f"{LOG_PREFIX} ⚠️ Non-zero retCode from {domain}: {data.get('retCode')}")
                     if attempt < retries - 1:
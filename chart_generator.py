@@ -5,8 +5,13 @@ import mplfinance as mpf
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from io import BytesIO
+from PIL import Image  # ships with matplotlib
 from datetime import datetime
+import traceback
 import warnings
+from utils import VERBOSE_LOGS
+
+LOG_PREFIX = "[chart_generator]"
 
 def get_confidence_color(confidence: float) -> str:
     """
@@ -355,7 +360,26 @@ def generate_chart_with_setup(df: pd.DataFrame,
     # Close figure to free memory
     plt.close(fig)
     
-    return buf
+    return _quantize_png(buf)
+
+
+def _quantize_png(buf: BytesIO) -> BytesIO:
+    """
+    Re-encode a rendered chart as a 256-colour palette PNG.
+    Charts are flat colours on white, so this is visually lossless while
+    cutting the upload to roughly a third of the RGBA size.
+    Falls back to the original buffer if re-encoding fails.
+    """
+    try:
+        with Image.open(buf) as img:
+            palette_img = img.convert('RGB').quantize(colors=256, method=Image.FASTOCTREE)
+        out = BytesIO()
+        palette_img.save(out, format='PNG')
+        out.seek(0)
+        return out
+    except Exception:
+        buf.seek(0)
+        return buf
 
 
 def generate_neutral_chart(df: pd.DataFrame,
@@ -382,3 +406,60 @@ def generate_neutral_chart(df: pd.DataFrame,
         ema_long=ema_long,
         exchange=exchange
     )
+
+def generate_chart_from_data(data: dict, symbol: str, timeframe: str, exchange: str = 'bybit'):
+    """Generate chart from trade plan data dict (entry point for the bot's chart process pool)"""
+    try:
+        direction = data.get('direction', 'neutral').lower()
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} 📊 Generating chart for {symbol} {timeframe} direction: {direction}")
+        
+        if direction == 'neutral':
+            if VERBOSE_LOGS:
+                print(f"{LOG_PREFIX} 🎨 Creating neutral chart")
+            chart_buf = generate_neutral_chart(
+                df=data['df'],
+                symbol=symbol,
+                timeframe=timeframe,
+                ema13=data.get('ema13_series'),
+                ema21=data.get('ema21_series'),
+                current_price=data.get('current_price'),
+                ema_short=data.get('ema_short', 13),
+                ema_long=data.get('ema_long', 21),
+                exchange=exchange
+            )
+        else:
+            if VERBOSE_LOGS:
+                print(f"{LOG_PREFIX} 🎨 Creating signal chart with setup")
+            chart_buf = generate_chart_with_setup(
+                df=data['df'],
+                symbol=symbol,
+                timeframe=timeframe,
+                direction=direction,
+                entry_price=data.get('entry'),
+                stop_loss=data.get('stop_loss'),
+                tp1=data.get('tp1'),
+                tp2=data.get('tp2'),
+                ema13=data.get('ema13_series'),
+                ema21=data.get('ema21_series'),
+                fvg_zones=data.get('fvg_zones'),
+                ob_high=data.get('ob_high'),
+                ob_low=data.get('ob_low'),
+                current_price=data.get('current_price'),
+                ema_short=data.get('ema_short', 13),
+                ema_long=data.get('ema_long', 21),
+                exchange=exchange,
+                confidence=data.get('confidence')
+            )
+        
+        if not chart_buf:
+            print(f"{LOG_PREFIX} ⚠️ Chart generation returned None")
+        elif VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} ✅ Chart generated successfully ({len(chart_buf.getvalue())} bytes)")
+        return chart_buf
+    except Exception as e:
+        print(f"{LOG_PREFIX} ❌ Chart generation error: {e}")
+        traceback.print_exc()
+        # A failed render can leave its figure open; drop it so workers don't leak
+        plt.close('all')
+        return None
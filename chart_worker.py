@@ -0,0 +1,8 @@
+def render(data: dict, symbol: str, timeframe: str, exchange: str = 'bybit'):
+    """Chart pool entry point: renders a trade plan data dict into a PNG buffer.
+
+    Kept separate from chart_generator so the bot process can reference it
+    without importing matplotlib/mplfinance; only the worker loads them.
+    """
+    from chart_generator import generate_chart_from_data
+    return generate_chart_from_data(data, symbol, timeframe, exchange)
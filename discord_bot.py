@@ -1,24 +1,33 @@
 import discord
 from discord.ext import commands
+import copy
 import json
 import os
 import traceback
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 import time
 import asyncio
 import re
+import threading
+from functools import lru_cache, partial
+from typing import NamedTuple, Optional
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import requests
 from urllib.parse import quote
 from dotenv import load_dotenv
-from signal_logic import generate_trade_plan
-from exchange_factory import normalize_symbol, pair_exists, get_all_pairs
-from utils import calculate_rr, format_price_dynamic
-from chart_generator import generate_chart_with_setup, generate_neutral_chart
-
-LOG_PREFIX = "[discord_bot]"
 
+# Load .env before the local modules below read their settings (VERBOSE_LOGS)
 load_dotenv()
 
+from signal_logic import generate_trade_plan, generate_trade_plans_both
+from exchange_factory import normalize_symbol, pair_exists, get_all_pairs, candle_aligned_expiry, EXCHANGE_CONCURRENCY
+from utils import calculate_rr, format_price_dynamic, VERBOSE_LOGS
+import chart_worker
+
+LOG_PREFIX = "[discord_bot]"
+
 # ============================
 # Load config
 # ============================
@@ -26,10 +35,48 @@ TOKEN = os.environ.get("DISCORD_TOKEN")
 WS_URL = os.environ.get("BYBIT_WS_URL", "wss://stream.bybit.com/v5/public/linear")
 BOT_TITLE_PREFIX = os.environ.get('BOT_TITLE_PREFIX', '💎 CRYPTO SIGNAL —')
 BOT_FOOTER_NAME = os.environ.get('BOT_FOOTER_NAME', 'Crypto Bot')
+VALID_TFS = ['1m','3m','5m','15m','30m','1h','2h','4h','6h','1d','1w','1M']
+# Parsed tokens are lowercased before lookup, so '1M' folds into '1m' here
+VALID_TFS_LOWER = frozenset(t.lower() for t in VALID_TFS)
+
+def _new_chart_pool():
+    """Build the chart process pool with an explicit start method.
+
+    The bot process is threaded (scan executor, HTTP pools), so forking it for
+    workers is unsafe; forkserver (or spawn where unavailable) starts workers
+    from a clean process that preloads chart_generator once.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    if ctx.get_start_method() == 'forkserver':
+        ctx.set_forkserver_preload(['chart_generator'])
+    return ProcessPoolExecutor(max_workers=max(2, (os.cpu_count() or 2) // 2), mp_context=ctx)
+
+# Dedicated process pool for chart rendering. Matplotlib work is CPU-bound and
+# holds the GIL, so separate processes render charts in parallel without
+# starving the signal scans in the default executor.
+CHART_POOL = _new_chart_pool()
 
 # ============================
 # Helper Functions
 # ============================
+_NOW_STR_CACHE = {'second': None, 'utc': '', 'wib': ''}
+
+def _now_strs():
+    """Return (UTC, WIB) timestamp strings for embeds, formatted at most once per second"""
+    second = int(time.time())
+    if _NOW_STR_CACHE['second'] != second:
+        now = datetime.fromtimestamp(second, timezone.utc)
+        _NOW_STR_CACHE['utc'] = now.strftime('%Y-%m-%d %H:%M:%S UTC')
+        _NOW_STR_CACHE['wib'] = (now + timedelta(hours=7)).strftime('%Y-%m-%d %H:%M:%S WIB')
+        _NOW_STR_CACHE['second'] = second
+    return _NOW_STR_CACHE['utc'], _NOW_STR_CACHE['wib']
+
+@lru_cache(maxsize=1024)
+def _tv_url(exchange_upper: str, symbol: str, interval: str) -> str:
+    """Build the TradingView perpetual chart URL (memoized, quote() is not free)"""
+    return f"https://www.tradingview.com/chart/?symbol={quote(f'{exchange_upper}:{symbol}.P')}&interval={interval}"
+
 def get_coin_image_url(symbol: str) -> str:
     """Get coin image URL from CoinGecko API"""
     try:
@@ -52,6 +99,132 @@ def get_coin_image_url(symbol: str) -> str:
         print(f"{LOG_PREFIX} ⚠️ Failed to get coin image for {symbol}: {e}")
         return ''
 
+def _validate_ema(ema_short: int, ema_long: int) -> Optional[str]:
+    """Return the user-facing error for an invalid EMA pair, or None if it's valid"""
+    if 5 <= ema_short < ema_long <= 200:
+        return None
+    if ema_short >= ema_long:
+        return "⚠️ EMA pendek harus lebih kecil dari EMA panjang."
+    return "⚠️ Periode EMA harus antara 5 dan 200."
+
+class ScanResult(NamedTuple):
+    """One evaluated setup from !scan / !scalp"""
+    coin: str
+    confidence: int
+    setup_str: str
+    data: dict
+
+# Recent trade plan results keyed by their arguments. Entries live for
+# PLAN_CACHE_TTL seconds but never past the close of the candle they were
+# computed on, so a new bar always triggers a fresh fetch.
+PLAN_CACHE_TTL = 45  # seconds
+PLAN_CACHE_MAXSIZE = 512
+_PLAN_CACHE = {}
+
+# In-flight trade plan computations keyed by their arguments, so identical
+# concurrent requests (e.g. two users scanning BTC at once) share one result
+_INFLIGHT_PLANS = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+def _plan_cache_expiry(timeframe: str, now: float) -> float:
+    """Expiry timestamp for a plan computed now: TTL, capped at the current candle close"""
+    return candle_aligned_expiry(timeframe, now, PLAN_CACHE_TTL)
+
+def _store_plan(key: tuple, timeframe: str, result: dict):
+    with _INFLIGHT_LOCK:
+        _PLAN_CACHE.pop(key, None)
+        if len(_PLAN_CACHE) >= PLAN_CACHE_MAXSIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _PLAN_CACHE.pop(next(iter(_PLAN_CACHE)))
+        _PLAN_CACHE[key] = (_plan_cache_expiry(timeframe, time.time()), result)
+
+def shared_trade_plan(symbol: str, timeframe: str, exchange: str, forced_direction: str = None, ema_short: int = 13, ema_long: int = 21, bypass_cache: bool = False):
+    """
+    Blocking generate_trade_plan(return_dict=True) with a short TTL cache and
+    single-flight coalescing. Recent identical results are served from memory; if an
+    identical call is already running in another thread, wait for its result instead
+    of fetching and computing the same plan again.
+
+    bypass_cache=True always downloads and computes a fresh plan (used by the ping
+    benchmark) and only refreshes the cache with the new result.
+    """
+    key = (symbol, timeframe, exchange, forced_direction, ema_short, ema_long)
+    if bypass_cache:
+        result = generate_trade_plan(symbol, timeframe, exchange, forced_direction=forced_direction, return_dict=True, ema_short=ema_short, ema_long=ema_long, fresh_data=True)
+        _store_plan(key, timeframe, result)
+        return dict(result)
+
+    with _INFLIGHT_LOCK:
+        cached = _PLAN_CACHE.get(key)
+        if cached is not None and time.time() < cached[0]:
+            if VERBOSE_LOGS:
+                print(f"{LOG_PREFIX} 💾 Using cached trade plan for {symbol} {timeframe} on {exchange.upper()}")
+            return dict(cached[1])
+        future = _INFLIGHT_PLANS.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _INFLIGHT_PLANS[key] = future
+    if not owner:
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} 🔗 Joining in-flight trade plan for {symbol} {timeframe} on {exchange.upper()}")
+        return dict(future.result())
+
+    try:
+        result = generate_trade_plan(symbol, timeframe, exchange, forced_direction=forced_direction, return_dict=True, ema_short=ema_short, ema_long=ema_long)
+        _store_plan(key, timeframe, result)
+        future.set_result(result)
+        return dict(result)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            del _INFLIGHT_PLANS[key]
+
+def shared_trade_plan_pair(symbol: str, timeframe: str, exchange: str, ema_short: int = 13, ema_long: int = 21):
+    """
+    Blocking long and short plans for one timeframe, returned as {'long': dict, 'short': dict}.
+    Served from the plan cache when both sides are fresh; otherwise computed from a
+    single OHLC fetch and stored per side, so later single-direction calls hit the cache.
+    """
+    keys = {side: (symbol, timeframe, exchange, side, ema_short, ema_long) for side in ('long', 'short')}
+    now = time.time()
+    with _INFLIGHT_LOCK:
+        cached = {side: _PLAN_CACHE.get(key) for side, key in keys.items()}
+    if all(entry is not None and now < entry[0] for entry in cached.values()):
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} 💾 Using cached long/short plans for {symbol} {timeframe} on {exchange.upper()}")
+        return {side: dict(entry[1]) for side, entry in cached.items()}
+
+    plans = generate_trade_plans_both(symbol, timeframe, exchange, ema_short=ema_short, ema_long=ema_long)
+    for side, plan in plans.items():
+        _store_plan(keys[side], timeframe, plan)
+    return {side: dict(plan) for side, plan in plans.items()}
+
+# Dedicated pool for trade plan jobs so scans don't queue behind other
+# default-executor work, plus a per-exchange cap on concurrent outbound jobs
+# to stay within exchange rate limits
+SCAN_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="scan")
+_EXCHANGE_SEMS = {}
+
+def _exchange_semaphore(exchange: str) -> asyncio.Semaphore:
+    # Created lazily so the semaphore binds to the running bot loop
+    sem = _EXCHANGE_SEMS.get(exchange)
+    if sem is None:
+        sem = _EXCHANGE_SEMS[exchange] = asyncio.Semaphore(EXCHANGE_CONCURRENCY)
+    return sem
+
+async def run_trade_plan(symbol: str, timeframe: str, exchange: str, forced_direction: str = None, ema_short: int = 13, ema_long: int = 21, bypass_cache: bool = False):
+    """Run shared_trade_plan on SCAN_EXECUTOR, gated by the exchange's concurrency limit"""
+    async with _exchange_semaphore(exchange):
+        return await bot.loop.run_in_executor(SCAN_EXECUTOR, partial(shared_trade_plan, symbol, timeframe, exchange, forced_direction, ema_short, ema_long, bypass_cache))
+
+async def run_trade_plan_pair(symbol: str, timeframe: str, exchange: str, ema_short: int = 13, ema_long: int = 21):
+    """Run shared_trade_plan_pair on SCAN_EXECUTOR, gated by the exchange's concurrency limit"""
+    async with _exchange_semaphore(exchange):
+        return await bot.loop.run_in_executor(SCAN_EXECUTOR, partial(shared_trade_plan_pair, symbol, timeframe, exchange, ema_short, ema_long))
+
 # ============================
 # Discord Setup
 # ============================
@@ -128,7 +301,6 @@ async def on_message(message):
         emas = []
         show_detail = False
         exchange = "bybit"  # Default exchange
-        valid_tfs = ['1m','3m','5m','15m','30m','1h','2h','4h','6h','1d','1w','1M']
         
         for part in remaining_parts:
             part_lower = part.lower()
@@ -141,7 +313,7 @@ async def on_message(message):
                 continue
             
             # Check if it's a timeframe
-            if part_lower in valid_tfs:
+            if part_lower in VALID_TFS_LOWER:
                 if timeframe is not None:
                     print(f"{LOG_PREFIX} ⚠️ Multiple timeframes detected: {timeframe} and {part_lower}")
                     await send_error(message, "⚠️ Timeframe hanya boleh satu.")
@@ -197,15 +369,11 @@ async def on_message(message):
             return
 
         # Validation for EMAs
-        if ema_short is not None and ema_long is not None:
-            if ema_short >= ema_long:
-                print(f"{LOG_PREFIX} ⚠️ Invalid EMA values: short({ema_short}) >= long({ema_long})")
-                await send_error(message, "⚠️ EMA pendek harus lebih kecil dari EMA panjang.")
-                return
-            if ema_short < 5 or ema_long > 200:
-                print(f"{LOG_PREFIX} ⚠️ EMA values out of range: short({ema_short}), long({ema_long})")
-                await send_error(message, "⚠️ Periode EMA harus antara 5 dan 200.")
-                return
+        ema_error = _validate_ema(ema_short, ema_long) if ema_short is not None else None
+        if ema_error:
+            print(f"{LOG_PREFIX} ⚠️ Invalid EMA values: short({ema_short}), long({ema_long})")
+            await send_error(message, ema_error)
+            return
 
         print(f"{LOG_PREFIX} 🚀 Generating signal for {symbol} {timeframe} direction={direction} exchange={exchange} ema_short={ema_short} ema_long={ema_long} detail={show_detail}")
         # Generate the signal
@@ -225,56 +393,21 @@ def safe_float(v):
     except Exception:
         return None
 
-def generate_chart_from_data(data: dict, symbol: str, timeframe: str, exchange: str = 'bybit'):
-    """Generate chart from trade plan data dict"""
+async def render_chart(data: dict, symbol: str, timeframe: str, exchange: str = 'bybit'):
+    """Render a chart in CHART_POOL; returns None instead of raising so callers can send text only"""
+    global CHART_POOL
+    pool = CHART_POOL
     try:
-        direction = data.get('direction', 'neutral').lower()
-        print(f"{LOG_PREFIX} 📊 Generating chart for {symbol} {timeframe} direction: {direction}")
-        
-        if direction == 'neutral':
-            print(f"{LOG_PREFIX} 🎨 Creating neutral chart")
-            chart_buf = generate_neutral_chart(
-                df=data['df'],
-                symbol=symbol,
-                timeframe=timeframe,
-                ema13=data.get('ema13_series'),
-                ema21=data.get('ema21_series'),
-                current_price=data.get('current_price'),
-                ema_short=data.get('ema_short', 13),
-                ema_long=data.get('ema_long', 21),
-                exchange=exchange
-            )
-        else:
-            print(f"{LOG_PREFIX} 🎨 Creating signal chart with setup")
-            chart_buf = generate_chart_with_setup(
-                df=data['df'],
-                symbol=symbol,
-                timeframe=timeframe,
-                direction=direction,
-                entry_price=data.get('entry'),
-                stop_loss=data.get('stop_loss'),
-                tp1=data.get('tp1'),
-                tp2=data.get('tp2'),
-                ema13=data.get('ema13_series'),
-                ema21=data.get('ema21_series'),
-                fvg_zones=data.get('fvg_zones'),
-                ob_high=data.get('ob_high'),
-                ob_low=data.get('ob_low'),
-                current_price=data.get('current_price'),
-                ema_short=data.get('ema_short', 13),
-                ema_long=data.get('ema_long', 21),
-                exchange=exchange,
-                confidence=data.get('confidence')
-            )
-        
-        if chart_buf:
-            print(f"{LOG_PREFIX} ✅ Chart generated successfully ({len(chart_buf.getvalue())} bytes)")
-        else:
-            print(f"{LOG_PREFIX} ⚠️ Chart generation returned None")
-        return chart_buf
+        return await bot.loop.run_in_executor(pool, chart_worker.render, data, symbol, timeframe, exchange)
+    except BrokenProcessPool as e:
+        # A worker died (OOM kill, segfault); the pool rejects all further work, so replace it
+        print(f"{LOG_PREFIX} ❌ Chart pool broken, recreating: {e}")
+        if CHART_POOL is pool:
+            CHART_POOL = _new_chart_pool()
+            pool.shutdown(wait=False)
+        return None
     except Exception as e:
-        print(f"{LOG_PREFIX} ❌ Chart generation error: {e}")
-        traceback.print_exc()
+        print(f"{LOG_PREFIX} ❌ Chart render failed: {e}")
         return None
 
 # Helper functions for sending responses (works for both commands and direct messages)
@@ -298,8 +431,18 @@ async def send_error(ctx_or_message, message: str):
     except Exception:
         pass  # Ignore if can't react
 
-async def get_available_coins(exchange='bybit'):
-    """Fetch and return a sorted list of unique base coins from exchange pairs."""
+# Coin lists change rarely: serve them from memory, and once an entry is older
+# than COINLIST_CACHE_TTL keep serving it while a background task refreshes it
+COINLIST_CACHE_TTL = 600  # seconds
+COINLIST_CHUNK_SIZE = 100
+_COINLIST_CACHE = {}  # exchange -> (fetched_at, coins, chunks)
+_COINLIST_REFRESHING = set()
+# Strong references to fire-and-forget tasks; the event loop only keeps weak
+# ones, so an unreferenced task could be garbage-collected mid-run
+_BACKGROUND_TASKS = set()
+
+async def _refresh_coinlist(exchange: str):
+    """Fetch the coin list for exchange and store it with its page chunks"""
     def fetch_coins():
         pairs = get_all_pairs(exchange=exchange, force_refresh=False)  # Use cache if available
         coins = set()
@@ -309,9 +452,38 @@ async def get_available_coins(exchange='bybit'):
             if base and base != pair:  # Avoid empty or unchanged pairs
                 coins.add(base.upper())
         return sorted(coins)
-    
-    # Run in executor since get_all_pairs might be blocking
-    return await bot.loop.run_in_executor(None, fetch_coins)
+
+    _COINLIST_REFRESHING.add(exchange)
+    try:
+        # Run in executor since get_all_pairs might be blocking
+        coins = await bot.loop.run_in_executor(None, fetch_coins)
+        chunks = [coins[i:i + COINLIST_CHUNK_SIZE] for i in range(0, len(coins), COINLIST_CHUNK_SIZE)]
+        if coins:
+            _COINLIST_CACHE[exchange] = (time.monotonic(), coins, chunks)
+        return coins, chunks
+    finally:
+        _COINLIST_REFRESHING.discard(exchange)
+
+async def _refresh_coinlist_quietly(exchange: str):
+    try:
+        await _refresh_coinlist(exchange)
+    except Exception as e:
+        print(f"{LOG_PREFIX} ⚠️ Background coinlist refresh failed for {exchange}: {e}")
+
+async def get_available_coins(exchange='bybit'):
+    """Return (coins, chunks): sorted unique base coins and their pages of COINLIST_CHUNK_SIZE."""
+    cached = _COINLIST_CACHE.get(exchange)
+    if cached is None:
+        return await _refresh_coinlist(exchange)
+
+    fetched_at, coins, chunks = cached
+    if time.monotonic() - fetched_at >= COINLIST_CACHE_TTL and exchange not in _COINLIST_REFRESHING:
+        print(f"{LOG_PREFIX} 🔄 Coinlist for {exchange} is stale, refreshing in background")
+        _COINLIST_REFRESHING.add(exchange)
+        task = asyncio.create_task(_refresh_coinlist_quietly(exchange))
+        _BACKGROUND_TASKS.add(task)
+        task.add_done_callback(_BACKGROUND_TASKS.discard)
+    return coins, chunks
 
 class CoinListView(discord.ui.View):
     def __init__(self, chunks, total_coins, timeout=300):
@@ -359,10 +531,9 @@ class CoinListView(discord.ui.View):
 async def generate_signal_response(ctx_or_message, symbol: str, timeframe: str, direction: str = None, exchange: str = "bybit", ema_short: int = None, ema_long: int = None, show_detail: bool = False):
     print(f"{LOG_PREFIX} 🚀 Starting signal generation for {symbol} {timeframe} direction={direction} ema_short={ema_short} ema_long={ema_long}")
     
-    valid_tfs = ['1m','3m','5m','15m','30m','1h','2h','4h','6h','1d','1w','1M']
-    if timeframe.lower() not in [t.lower() for t in valid_tfs]:
+    if timeframe.lower() not in VALID_TFS_LOWER:
         print(f"{LOG_PREFIX} ⚠️ Invalid timeframe: {timeframe}")
-        await send_error(ctx_or_message, f"⚠️ Invalid timeframe `{timeframe}`. Pilih dari {valid_tfs}.")
+        await send_error(ctx_or_message, f"⚠️ Invalid timeframe `{timeframe}`. Pilih dari {VALID_TFS}.")
         return
 
     forced = None
@@ -381,7 +552,7 @@ async def generate_signal_response(ctx_or_message, symbol: str, timeframe: str,
             print(f"{LOG_PREFIX} ❌ Pair not available: {symbol_norm}")
             return f"❌ Pasangan `{symbol_norm}` tidak tersedia di {exchange.upper()}."
         # Get dict data for chart generation
-        result = generate_trade_plan(symbol_norm, timeframe, exchange, forced_direction=forced, return_dict=True, ema_short=ema_short or 13, ema_long=ema_long or 21)
+        result = shared_trade_plan(symbol_norm, timeframe, exchange, forced, ema_short or 13, ema_long or 21)
         print(f"{LOG_PREFIX} ✅ Signal generation completed for {symbol_norm}")
         return result
 
@@ -397,7 +568,7 @@ async def generate_signal_response(ctx_or_message, symbol: str, timeframe: str,
         print(f"{LOG_PREFIX} 📊 Generating chart for {symbol_norm}...")
         
         # Generate chart
-        chart_buf = await bot.loop.run_in_executor(None, generate_chart_from_data, result, symbol_norm, timeframe, exchange)
+        chart_buf = await render_chart(result, symbol_norm, timeframe, exchange)
         
         # Create embed
         print(f"{LOG_PREFIX} 📝 Creating embed for signal response")
@@ -437,7 +608,7 @@ def create_signal_embed_from_dict(data: dict, symbol: str, timeframe: str, show_
     # Ensure original EMAs are not None
     original_ema_short = original_ema_short or 13
     original_ema_long = original_ema_long or 21
-    current_time = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
+    current_time, wib_time = _now_strs()
     
     direction_val = data.get('direction', 'NETRAL').upper()
     
@@ -459,7 +630,7 @@ def create_signal_embed_from_dict(data: dict, symbol: str, timeframe: str, show_
     # Ensure symbol ends with USDT for proper TradingView pair notation
     if not symbol.endswith('USDT'):
         symbol += 'USDT'
-    tv_url = f"https://www.tradingview.com/chart/?symbol={quote(f'{exchange_upper}:{symbol}.P')}&interval={interval}"
+    tv_url = _tv_url(exchange_upper, symbol, interval)
     
     embed = discord.Embed(color=color)
     
@@ -525,9 +696,7 @@ def create_signal_embed_from_dict(data: dict, symbol: str, timeframe: str, show_
         if show_detail:
             embed.add_field(name="📋 Detailed Analysis", value=data.get('insight', 'No details available.'), inline=False)
     
-    # Convert to Indonesian WIB time (UTC+7)
-    from datetime import timedelta
-    wib_time = (datetime.now(timezone.utc) + timedelta(hours=7)).strftime('%Y-%m-%d %H:%M:%S WIB')
+    # Footer uses Indonesian WIB time (UTC+7)
     embed.set_footer(text=f"{BOT_FOOTER_NAME} • Time: {wib_time}")
     
     # Set chart as image (will be attached separately)
@@ -593,7 +762,6 @@ async def signal_command(ctx, *args):
     emas = []
     show_detail = False
     exchange = "bybit"  # Default exchange
-    valid_tfs = ['1m','3m','5m','15m','30m','1h','2h','4h','6h','1d','1w','1M']
     
     for part in remaining_parts:
         part_lower = part.lower()
@@ -606,7 +774,7 @@ async def signal_command(ctx, *args):
             continue
         
         # Check if it's a timeframe
-        if part_lower in valid_tfs:
+        if part_lower in VALID_TFS_LOWER:
             if timeframe is not None:
                 await send_error(ctx, "⚠️ Timeframe hanya boleh satu.")
                 return
@@ -648,16 +816,16 @@ async def signal_command(ctx, *args):
         ema_long = None
 
     # Validation for EMAs
-    if ema_short is not None and ema_long is not None:
-        if ema_short >= ema_long:
-            await send_error(ctx, "⚠️ EMA pendek harus lebih kecil dari EMA panjang.")
-            return
-        if ema_short < 5 or ema_long > 200:
-            await send_error(ctx, "⚠️ Periode EMA harus antara 5 dan 200.")
-            return
+    ema_error = _validate_ema(ema_short, ema_long) if ema_short is not None else None
+    if ema_error:
+        await send_error(ctx, ema_error)
+        return
     
     await generate_signal_response(ctx, symbol, timeframe, direction, exchange, ema_short, ema_long, show_detail)
 
+# Separators between coins in !scan / !scalp ("BTC,ETH" and "BTC, ETH" alike)
+_COIN_SPLIT_RE = re.compile(r'[,\s]+')
+
 @bot.command(name="scan")
 async def scan_command(ctx, *, args: str):
     """
@@ -680,7 +848,6 @@ async def scan_command(ctx, *, args: str):
     coins = []
     emas = []
     exchange = "bybit"  # Default exchange
-    valid_tfs = ['1m','3m','5m','15m','30m','1h','2h','4h','6h','1d','1w','1M']
 
     for part in parts:
         part_lower = part.lower()
@@ -701,12 +868,8 @@ async def scan_command(ctx, *, args: str):
             # Assume it's a coin (possibly comma-separated)
             coins.append(part.strip().upper())
 
-    # Process coins (split by comma if needed)
-    coins_list = []
-    for coin_part in coins:
-        coins_list.extend([c.strip() for c in coin_part.split(',') if c.strip()])
-    
-    coins_final = [c for c in coins_list if c]
+    # Process coins (split by comma if needed), dropping duplicates but keeping order
+    coins_final = list(dict.fromkeys(c for c in _COIN_SPLIT_RE.split(",".join(coins)) if c))
     
     if not coins_final:
         await send_error(ctx, "⚠️ Tidak ada koin yang valid diberikan.")
@@ -734,88 +897,86 @@ async def scan_command(ctx, *, args: str):
         ema_long = 21   # Default
 
     # Validation for EMAs
-    if ema_short >= ema_long:
-        await send_error(ctx, "⚠️ EMA pendek harus lebih kecil dari EMA panjang.")
-        return
-    if ema_short < 5 or ema_long > 200:
-        await send_error(ctx, "⚠️ Periode EMA harus antara 5 dan 200.")
+    ema_error = _validate_ema(ema_short, ema_long)
+    if ema_error:
+        await send_error(ctx, ema_error)
         return
 
     print(f"{LOG_PREFIX} 🔍 Scan command triggered by {ctx.author} for coins: {coins_final} with EMA {ema_short}/{ema_long} on {exchange.upper()}")
 
     # Define all setups to check
-    setups = [
-        ("1h", "long"),    # $coin 1h long
-        ("1h", "short"),   # $coin 1h short
-        ("4h", "long"),    # $coin 4h long
-        ("4h", "short"),   # $coin 4h short
-    ]
+    # Each timeframe is scanned long and short from one fetch:
+    # $coin 1h long, $coin 1h short, $coin 4h long, $coin 4h short
+    timeframes = ["1h", "4h"]
 
-    # Create all scan tasks for parallel execution
-    scan_tasks = []
+    # Collect coins to scan
+    scan_coins = []
     for coin in coins_final:
         # Check if coin looks like a timeframe or direction - hint to use $ command
         coin_lower = coin.lower()
-        if coin_lower in [t.lower() for t in valid_tfs] or coin_lower in ('long', 'short', 'detail'):
+        if coin_lower in VALID_TFS_LOWER or coin_lower in ('long', 'short', 'detail'):
             await send_error(ctx, f"⚠️ '{coin}' terlihat seperti parameter untuk sinyal tunggal. Jika Anda ingin sinyal tunggal, gunakan perintah `$` seperti `$BTC 1d long detail`.")
             continue
+        scan_coins.append(coin)
+    # Normalize each coin once; reused by the tasks and the result loop
+    symbol_map = {coin: normalize_symbol(coin, exchange) for coin in scan_coins}
 
-        for timeframe, direction in setups:
-            setup_str = f"${coin} {timeframe}"
-            if direction:
-                setup_str += f" {direction}"
+    # Resolve pair existence once per coin so unknown pairs skip all setups
+    pairs_found = await asyncio.gather(*[
+        bot.loop.run_in_executor(None, pair_exists, symbol_map[coin], exchange)
+        for coin in scan_coins
+    ])
 
-            # Append custom EMA values if not using defaults (13/21)
-            if ema_short != 13 or ema_long != 21:
-                setup_str += f" ema{ema_short} ema{ema_long}"
-
-            scan_tasks.append((coin, timeframe, direction, setup_str))
+    # Create all scan tasks for parallel execution
+    # Append custom EMA values to the setup label if not using defaults (13/21)
+    ema_suffix = f" ema{ema_short} ema{ema_long}" if (ema_short, ema_long) != (13, 21) else ""
+    scan_tasks = []
+    for coin, found in zip(scan_coins, pairs_found):
+        symbol_norm = symbol_map[coin]
+        if not found:
+            print(f"{LOG_PREFIX} ❌ Pair not available: {coin}")
+            await send_error(ctx, f"❌ Pasangan `{symbol_norm}` tidak tersedia di {exchange.upper()}.")
+            coins_final.remove(coin)
+            continue
 
-    print(f"{LOG_PREFIX} 🚀 Starting parallel scan for {len(scan_tasks)} setups across {len(coins_final)} coins")
+        for timeframe in timeframes:
+            scan_tasks.append((coin, symbol_norm, timeframe))
 
-    # Execute all scans in parallel
-    async def run_single_scan(coin, timeframe, direction, setup_str):
-        def run_scan():
-            symbol_norm = normalize_symbol(coin, exchange)
-            if not pair_exists(symbol_norm, exchange):
-                return None
-            result = generate_trade_plan(symbol_norm, timeframe, exchange, forced_direction=direction, return_dict=True, ema_short=ema_short, ema_long=ema_long)
-            return result, setup_str
+    print(f"{LOG_PREFIX} 🚀 Starting parallel scan for {len(scan_tasks) * 2} setups across {len(coins_final)} coins")
 
+    # Execute all scans in parallel: one job per coin/timeframe yields both directions
+    async def run_single_scan(coin, symbol_norm, timeframe):
         try:
-            result_tuple = await bot.loop.run_in_executor(None, run_scan)
-            if result_tuple is None:
-                print(f"{LOG_PREFIX} ❌ Pair not available: {coin}")
-                return None
-            result, setup_str = result_tuple
-            if isinstance(result, str):
-                print(f"{LOG_PREFIX} ❌ Signal generation returned error for {setup_str}: {result}")
-                return None
-            confidence = result.get('confidence', 0)
-            print(f"{LOG_PREFIX} ✅ Setup {setup_str}: confidence {confidence}%")
-            return (coin, confidence, setup_str, result)
+            plans = await run_trade_plan_pair(symbol_norm, timeframe, exchange, ema_short, ema_long)
         except Exception as e:
-            print(f"{LOG_PREFIX} ❌ Error scanning {setup_str}: {e}")
-            return None
+            print(f"{LOG_PREFIX} ❌ Error scanning ${coin} {timeframe}{ema_suffix}: {e}")
+            return []
+        results = []
+        for direction, result in plans.items():
+            setup_str = f"${coin} {timeframe} {direction}{ema_suffix}"
+            confidence = result.get('confidence', 0)
+            if VERBOSE_LOGS:
+                print(f"{LOG_PREFIX} ✅ Setup {setup_str}: confidence {confidence}%")
+            results.append(ScanResult(coin, confidence, setup_str, result))
+        return results
 
     # Create and run all tasks concurrently
-    tasks = [run_single_scan(coin, tf, dir, setup) for coin, tf, dir, setup in scan_tasks]
-    scan_results = await asyncio.gather(*tasks, return_exceptions=True)
+    tasks = [run_single_scan(coin, sym, tf) for coin, sym, tf in scan_tasks]
+    # run_single_scan handles its own errors, so no exception boxing is needed
+    scan_results = await asyncio.gather(*tasks)
 
     # Group results by coin
     coin_results = {}
-    for result in scan_results:
-        if result is None or isinstance(result, Exception):
-            continue
-        coin, confidence, setup_str, data = result
-        if coin not in coin_results:
-            coin_results[coin] = []
-        coin_results[coin].append((confidence, setup_str, data))
+    for results in scan_results:
+        for result in results:
+            coin_results.setdefault(result.coin, []).append((result.confidence, result.setup_str, result.data))
 
-    # Process results for each coin
+    # Pick the best setup per coin and start rendering its chart right away,
+    # so all charts render in parallel while the embeds are being prepared
+    best_per_coin = []
     for coin in coins_final:
         if coin not in coin_results or not coin_results[coin]:
-            await send_error(ctx, f"⚠️ Tidak ada hasil valid untuk {coin}. Pasangan mungkin tidak ada.")
+            best_per_coin.append((coin, None))
             continue
 
         results = coin_results[coin]
@@ -830,12 +991,23 @@ async def scan_command(ctx, *, args: str):
 
         print(f"{LOG_PREFIX} 🏆 Best setup for {coin}: {best_setup} with {best_confidence}% confidence")
 
-        # Generate chart for best result
-        chart_buf = await bot.loop.run_in_executor(None, generate_chart_from_data, best_data, normalize_symbol(coin, exchange), best_timeframe, exchange)
+        # Generate chart for best result (awaited just before sending)
+        symbol_norm = symbol_map[coin]
+        chart_future = asyncio.create_task(render_chart(best_data, symbol_norm, best_timeframe, exchange))
+        best_per_coin.append((coin, (results, best_data, best_timeframe, symbol_norm, chart_future)))
+
+    # Process results for each coin: every coin waits only on its own chart,
+    # and the Discord uploads for all coins go out concurrently
+    async def send_coin_result(coin, best):
+        if best is None:
+            await send_error(ctx, f"⚠️ Tidak ada hasil valid untuk {coin}. Pasangan mungkin tidak ada.")
+            return
+
+        results, best_data, best_timeframe, symbol_norm, chart_future = best
 
         # Create embed with all confidences listed
-        symbol_norm = normalize_symbol(coin, exchange)
         embed, view = create_scan_embed_from_dict(best_data, symbol_norm, best_timeframe, results, exchange, ema_short, ema_long, None, ctx.author.id, "Scanned")
+        chart_buf = await chart_future
 
         # Send response
         if chart_buf:
@@ -854,6 +1026,8 @@ async def scan_command(ctx, *, args: str):
 
         print(f"{LOG_PREFIX} ✅ Scan result sent for {coin}")
 
+    await asyncio.gather(*(send_coin_result(coin, best) for coin, best in best_per_coin))
+
 @bot.command(name="scalp")
 async def scalp_command(ctx, *, args: str):
     """
@@ -876,7 +1050,6 @@ async def scalp_command(ctx, *, args: str):
     coins = []
     emas = []
     exchange = "bybit"  # Default exchange
-    valid_tfs = ['1m','3m','5m','15m','30m','1h','2h','4h','6h','1d','1w','1M']
 
     for part in parts:
         part_lower = part.lower()
@@ -897,12 +1070,8 @@ async def scalp_command(ctx, *, args: str):
             # Assume it's a coin (possibly comma-separated)
             coins.append(part.strip().upper())
 
-    # Process coins (split by comma if needed)
-    coins_list = []
-    for coin_part in coins:
-        coins_list.extend([c.strip() for c in coin_part.split(',') if c.strip()])
-    
-    coins_final = [c for c in coins_list if c]
+    # Process coins (split by comma if needed), dropping duplicates but keeping order
+    coins_final = list(dict.fromkeys(c for c in _COIN_SPLIT_RE.split(",".join(coins)) if c))
     
     if not coins_final:
         await send_error(ctx, "⚠️ Tidak ada koin yang valid diberikan.")
@@ -930,88 +1099,86 @@ async def scalp_command(ctx, *, args: str):
         ema_long = 21   # Default
 
     # Validation for EMAs
-    if ema_short >= ema_long:
-        await send_error(ctx, "⚠️ EMA pendek harus lebih kecil dari EMA panjang.")
-        return
-    if ema_short < 5 or ema_long > 200:
-        await send_error(ctx, "⚠️ Periode EMA harus antara 5 dan 200.")
+    ema_error = _validate_ema(ema_short, ema_long)
+    if ema_error:
+        await send_error(ctx, ema_error)
         return
 
     print(f"{LOG_PREFIX} 🔍 Scalp command triggered by {ctx.author} for coins: {coins_final} with EMA {ema_short}/{ema_long} on {exchange.upper()}")
 
     # Define all setups to check (short timeframes for scalping)
-    setups = [
-        ("15m", "long"),   # $coin 15m long
-        ("15m", "short"),  # $coin 15m short
-        ("30m", "long"),   # $coin 30m long
-        ("30m", "short"),  # $coin 30m short
-    ]
+    # Each timeframe is scanned long and short from one fetch:
+    # $coin 15m long, $coin 15m short, $coin 30m long, $coin 30m short
+    timeframes = ["15m", "30m"]
 
-    # Create all scalp tasks for parallel execution
-    scalp_tasks = []
+    # Collect coins to scalp
+    scalp_coins = []
     for coin in coins_final:
         # Check if coin looks like a timeframe or direction - hint to use $ command
         coin_lower = coin.lower()
-        if coin_lower in [t.lower() for t in valid_tfs] or coin_lower in ('long', 'short', 'detail'):
+        if coin_lower in VALID_TFS_LOWER or coin_lower in ('long', 'short', 'detail'):
             await send_error(ctx, f"⚠️ '{coin}' terlihat seperti parameter untuk sinyal tunggal. Jika Anda ingin sinyal tunggal, gunakan perintah `$` seperti `$BTC 1d long detail`.")
             continue
+        scalp_coins.append(coin)
+    # Normalize each coin once; reused by the tasks and the result loop
+    symbol_map = {coin: normalize_symbol(coin, exchange) for coin in scalp_coins}
 
-        for timeframe, direction in setups:
-            setup_str = f"${coin} {timeframe}"
-            if direction:
-                setup_str += f" {direction}"
-
-            # Append custom EMA values if not using defaults (13/21)
-            if ema_short != 13 or ema_long != 21:
-                setup_str += f" ema{ema_short} ema{ema_long}"
+    # Resolve pair existence once per coin so unknown pairs skip all setups
+    pairs_found = await asyncio.gather(*[
+        bot.loop.run_in_executor(None, pair_exists, symbol_map[coin], exchange)
+        for coin in scalp_coins
+    ])
 
-            scalp_tasks.append((coin, timeframe, direction, setup_str))
+    # Create all scalp tasks for parallel execution
+    # Append custom EMA values to the setup label if not using defaults (13/21)
+    ema_suffix = f" ema{ema_short} ema{ema_long}" if (ema_short, ema_long) != (13, 21) else ""
+    scalp_tasks = []
+    for coin, found in zip(scalp_coins, pairs_found):
+        symbol_norm = symbol_map[coin]
+        if not found:
+            print(f"{LOG_PREFIX} ❌ Pair not available: {coin}")
+            await send_error(ctx, f"❌ Pasangan `{symbol_norm}` tidak tersedia di {exchange.upper()}.")
+            coins_final.remove(coin)
+            continue
 
-    print(f"{LOG_PREFIX} 🚀 Starting parallel scalp for {len(scalp_tasks)} setups across {len(coins_final)} coins")
+        for timeframe in timeframes:
+            scalp_tasks.append((coin, symbol_norm, timeframe))
 
-    # Execute all scalps in parallel
-    async def run_single_scalp(coin, timeframe, direction, setup_str):
-        def run_scalp():
-            symbol_norm = normalize_symbol(coin, exchange)
-            if not pair_exists(symbol_norm, exchange):
-                return None
-            result = generate_trade_plan(symbol_norm, timeframe, exchange, forced_direction=direction, return_dict=True, ema_short=ema_short, ema_long=ema_long)
-            return result, setup_str
+    print(f"{LOG_PREFIX} 🚀 Starting parallel scalp for {len(scalp_tasks) * 2} setups across {len(coins_final)} coins")
 
+    # Execute all scalps in parallel: one job per coin/timeframe yields both directions
+    async def run_single_scalp(coin, symbol_norm, timeframe):
         try:
-            result_tuple = await bot.loop.run_in_executor(None, run_scalp)
-            if result_tuple is None:
-                print(f"{LOG_PREFIX} ❌ Pair not available: {coin}")
-                return None
-            result, setup_str = result_tuple
-            if isinstance(result, str):
-                print(f"{LOG_PREFIX} ❌ Signal generation returned error for {setup_str}: {result}")
-                return None
-            confidence = result.get('confidence', 0)
-            print(f"{LOG_PREFIX} ✅ Setup {setup_str}: confidence {confidence}%")
-            return (coin, confidence, setup_str, result)
+            plans = await run_trade_plan_pair(symbol_norm, timeframe, exchange, ema_short, ema_long)
         except Exception as e:
-            print(f"{LOG_PREFIX} ❌ Error scalping {setup_str}: {e}")
-            return None
+            print(f"{LOG_PREFIX} ❌ Error scalping ${coin} {timeframe}{ema_suffix}: {e}")
+            return []
+        results = []
+        for direction, result in plans.items():
+            setup_str = f"${coin} {timeframe} {direction}{ema_suffix}"
+            confidence = result.get('confidence', 0)
+            if VERBOSE_LOGS:
+                print(f"{LOG_PREFIX} ✅ Setup {setup_str}: confidence {confidence}%")
+            results.append(ScanResult(coin, confidence, setup_str, result))
+        return results
 
     # Create and run all tasks concurrently
-    tasks = [run_single_scalp(coin, tf, dir, setup) for coin, tf, dir, setup in scalp_tasks]
-    scalp_results = await asyncio.gather(*tasks, return_exceptions=True)
+    tasks = [run_single_scalp(coin, sym, tf) for coin, sym, tf in scalp_tasks]
+    # run_single_scalp handles its own errors, so no exception boxing is needed
+    scalp_results = await asyncio.gather(*tasks)
 
     # Group results by coin
     coin_results = {}
-    for result in scalp_results:
-        if result is None or isinstance(result, Exception):
-            continue
-        coin, confidence, setup_str, data = result
-        if coin not in coin_results:
-            coin_results[coin] = []
-        coin_results[coin].append((confidence, setup_str, data))
+    for results in scalp_results:
+        for result in results:
+            coin_results.setdefault(result.coin, []).append((result.confidence, result.setup_str, result.data))
 
-    # Process results for each coin
+    # Pick the best setup per coin and start rendering its chart right away,
+    # so all charts render in parallel while the embeds are being prepared
+    best_per_coin = []
     for coin in coins_final:
         if coin not in coin_results or not coin_results[coin]:
-            await send_error(ctx, f"⚠️ Tidak ada hasil valid untuk {coin}. Pasangan mungkin tidak ada.")
+            best_per_coin.append((coin, None))
             continue
 
         results = coin_results[coin]
@@ -1026,12 +1193,23 @@ async def scalp_command(ctx, *, args: str):
 
         print(f"{LOG_PREFIX} 🏆 Best setup for {coin}: {best_setup} with {best_confidence}% confidence")
 
-        # Generate chart for best result
-        chart_buf = await bot.loop.run_in_executor(None, generate_chart_from_data, best_data, normalize_symbol(coin, exchange), best_timeframe, exchange)
+        # Generate chart for best result (awaited just before sending)
+        symbol_norm = symbol_map[coin]
+        chart_future = asyncio.create_task(render_chart(best_data, symbol_norm, best_timeframe, exchange))
+        best_per_coin.append((coin, (results, best_data, best_timeframe, symbol_norm, chart_future)))
+
+    # Process results for each coin: every coin waits only on its own chart,
+    # and the Discord uploads for all coins go out concurrently
+    async def send_coin_result(coin, best):
+        if best is None:
+            await send_error(ctx, f"⚠️ Tidak ada hasil valid untuk {coin}. Pasangan mungkin tidak ada.")
+            return
+
+        results, best_data, best_timeframe, symbol_norm, chart_future = best
 
         # Create embed with all confidences listed
-        symbol_norm = normalize_symbol(coin, exchange)
         embed, view = create_scan_embed_from_dict(best_data, symbol_norm, best_timeframe, results, exchange, ema_short, ema_long, None, ctx.author.id, "Scalped")
+        chart_buf = await chart_future
 
         # Send response
         if chart_buf:
@@ -1050,11 +1228,13 @@ async def scalp_command(ctx, *, args: str):
 
         print(f"{LOG_PREFIX} ✅ Scalp result sent for {coin}")
 
+    await asyncio.gather(*(send_coin_result(coin, best) for coin, best in best_per_coin))
+
 def create_scan_embed_from_dict(data: dict, symbol: str, timeframe: str, all_results: list, exchange: str = 'bybit', original_ema_short: int = 13, original_ema_long: int = 21, direction: str = None, user_id: int = None, scan_type: str = "Scanned"):
     # Ensure original EMAs are not None
     original_ema_short = original_ema_short or 13
     original_ema_long = original_ema_long or 21
-    current_time = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
+    current_time, wib_time = _now_strs()
     
     direction_val = data.get('direction', 'NETRAL').upper()
     
@@ -1076,7 +1256,7 @@ def create_scan_embed_from_dict(data: dict, symbol: str, timeframe: str, all_res
     # Ensure symbol ends with USDT for proper TradingView pair notation
     if not symbol.endswith('USDT'):
         symbol += 'USDT'
-    tv_url = f"https://www.tradingview.com/chart/?symbol={quote(f'{exchange_upper}:{symbol}.P')}&interval={interval}"
+    tv_url = _tv_url(exchange_upper, symbol, interval)
     
     embed = discord.Embed(color=color)
     
@@ -1143,9 +1323,7 @@ def create_scan_embed_from_dict(data: dict, symbol: str, timeframe: str, all_res
     confidence_list = "\n".join(confidence_items)
     embed.add_field(name=f"📋 All Confidences ({scan_type} Setups)", value=confidence_list, inline=False)
     
-    # Convert to Indonesian WIB time (UTC+7)
-    from datetime import timedelta
-    wib_time = (datetime.now(timezone.utc) + timedelta(hours=7)).strftime('%Y-%m-%d %H:%M:%S WIB')
+    # Footer uses Indonesian WIB time (UTC+7)
     embed.set_footer(text=f"{BOT_FOOTER_NAME} • Time: {wib_time}")
     
     # Set chart as image
@@ -1182,6 +1360,14 @@ def create_scan_embed_from_dict(data: dict, symbol: str, timeframe: str, all_res
     
     return embed, view
 
+# Exchange keywords accepted by !coinlist, checked in priority order
+COINLIST_EXCHANGES = {
+    'binance': 'binance',
+    'bitget': 'bitget',
+    'gateio': 'gateio',
+    'gate': 'gateio',
+}
+
 @bot.command(name="coinlist")
 async def coinlist_command(ctx, *, args: str = ""):
     """
@@ -1191,27 +1377,17 @@ async def coinlist_command(ctx, *, args: str = ""):
     print(f"{LOG_PREFIX} 📋 Coinlist command triggered by {ctx.author}")
     
     # Parse exchange (default to bybit)
-    args_lower = args.lower()
-    if 'binance' in args_lower:
-        exchange = 'binance'
-    elif 'bitget' in args_lower:
-        exchange = 'bitget'
-    elif 'gateio' in args_lower or 'gate' in args_lower:
-        exchange = 'gateio'
-    else:
-        exchange = 'bybit'
+    args_lower = args.casefold()
+    exchange = next((ex for key, ex in COINLIST_EXCHANGES.items() if key in args_lower), 'bybit')
     print(f"{LOG_PREFIX} 🏦 Using exchange: {exchange}")
     
     try:
-        coins = await get_available_coins(exchange=exchange)
+        # Coins come pre-split into pages of 100 for pagination
+        coins, chunks = await get_available_coins(exchange=exchange)
         if not coins:
             await send_error(ctx, "⚠️ Tidak ada koin yang tersedia saat ini. Coba lagi nanti.")
             return
         
-        # Split coins into chunks of 100 for pagination
-        chunk_size = 100
-        chunks = [coins[i:i + chunk_size] for i in range(0, len(coins), chunk_size)]
-        
         view = CoinListView(chunks, len(coins))
         embed = view.get_embed()
         embed.title = f"📋 Available Coins ({exchange.upper()})"
@@ -1246,15 +1422,15 @@ async def ping_command(ctx):
 
     async def bench_exchange(exch: str, timeout: int = 20):
         """Run generate_trade_plan in a threadpool for the given exchange and return ms or 'Error' on failure/timeout."""
-        loop = bot.loop
-        start = time.time()
+        start = time.perf_counter_ns()
         try:
-            coro = loop.run_in_executor(None, lambda: generate_trade_plan("BTC", "1h", exch, forced_direction=None, return_dict=True, ema_short=13, ema_long=21))
+            # Bypass the plan cache so the benchmark measures the exchange, not memory
+            coro = run_trade_plan(normalize_symbol("BTC", exch), "1h", exch, bypass_cache=True)
             # enforce timeout for each exchange
             result = await asyncio.wait_for(coro, timeout=timeout)
             if isinstance(result, str):
                 return exch, "Error"
-            elapsed = round((time.time() - start) * 1000)
+            elapsed = (time.perf_counter_ns() - start) // 1_000_000
             return exch, elapsed
         except asyncio.TimeoutError:
             return exch, "Timeout"
@@ -1280,7 +1456,7 @@ async def ping_command(ctx):
         else:
             embed.add_field(name=f"🏦 {exchange.upper()}", value=f"`{time_taken} ms`", inline=True)
     
-    embed.set_footer(text=f"{BOT_FOOTER_NAME}")
+    embed.set_footer(text=f"{BOT_FOOTER_NAME} • Cached plans: {len(_PLAN_CACHE)}")
     
     await ctx.send(embed=embed)
     print(f"{LOG_PREFIX} ✅ Ping command completed")
@@ -1288,11 +1464,8 @@ async def ping_command(ctx):
 # ============================
 # Slash Commands
 # ============================
-@tree.command(name="help", description="Tampilkan perintah yang tersedia dan informasi penggunaan")
-async def slash_help(interaction: discord.Interaction):
-    """Tampilkan perintah yang tersedia dan informasi penggunaan"""
-    print(f"{LOG_PREFIX} ❓ Help command triggered by {interaction.user}")
-    
+def _build_help_embed() -> discord.Embed:
+    """Build the static /help embed"""
     embed = discord.Embed(
         title="🤖💎 **CRYPTO SIGNAL BOT** — Panduan Lengkap",
         description="🚀 **Bot Sinyal Trading Cryptocurrency** dengan analisis teknikal canggih menggunakan indikator RSI dan EMA untuk membantu trading Anda!",
@@ -1409,6 +1582,20 @@ async def slash_help(interaction: discord.Interaction):
         name="Crypto Signal Bot"
     )
 
+    return embed
+
+# The help content never changes: build it once and keep its payload, then
+# rehydrate a fresh Embed per send. Embed.from_dict keeps references to the
+# dict's nested lists (fields), so each send works on a deep copy
+HELP_EMBED_DICT = _build_help_embed().to_dict()
+
+@tree.command(name="help", description="Tampilkan perintah yang tersedia dan informasi penggunaan")
+async def slash_help(interaction: discord.Interaction):
+    """Tampilkan perintah yang tersedia dan informasi penggunaan"""
+    print(f"{LOG_PREFIX} ❓ Help command triggered by {interaction.user}")
+    
+    embed = discord.Embed.from_dict(copy.deepcopy(HELP_EMBED_DICT))
+
     try:
         print(f"{LOG_PREFIX} 📤 Sending help embed")
         await interaction.response.send_message(embed=embed)
@@ -1431,32 +1618,24 @@ async def slash_help(interaction: discord.Interaction):
 # ============================
 async def scan_single_coin(coin, ema_short, ema_long, exchange):
     """Scan a single coin with given EMA and return best result, timeframe, and all results"""
-    setups = [
-        ("1h", "long"),
-        ("1h", "short"), 
-        ("4h", "long"),
-        ("4h", "short"),
-    ]
+    # Long and short for each timeframe come from one fetch
+    timeframes = ["1h", "4h"]
+    
+    symbol_norm = normalize_symbol(coin, exchange)
+    if not await bot.loop.run_in_executor(None, pair_exists, symbol_norm, exchange):
+        return None, None, []
     
     results = []
-    for timeframe, direction in setups:
-        def run_scan():
-            symbol_norm = normalize_symbol(coin, exchange)
-            if not pair_exists(symbol_norm, exchange):
-                return None
-            result = generate_trade_plan(symbol_norm, timeframe, exchange, forced_direction=direction, return_dict=True, ema_short=ema_short, ema_long=ema_long)
-            return result
-        
+    for timeframe in timeframes:
         try:
-            result = await bot.loop.run_in_executor(None, run_scan)
-            if result is None or isinstance(result, str):
-                continue
+            plans = await run_trade_plan_pair(symbol_norm, timeframe, exchange, ema_short, ema_long)
+        except Exception as e:
+            print(f"{LOG_PREFIX} ❌ Error scanning {coin} {timeframe}: {e}")
+            continue
+        for direction, result in plans.items():
             confidence = result.get('confidence', 0)
             setup_str = f"${coin} {timeframe} {direction}"
             results.append((confidence, setup_str, result))
-        except Exception as e:
-            print(f"{LOG_PREFIX} ❌ Error scanning {coin} {timeframe} {direction}: {e}")
-            continue
     
     if not results:
         return None, None, []
@@ -1499,11 +1678,11 @@ async def on_interaction(interaction):
             await interaction.response.defer()
             
             # Regenerate signal with target EMAs
+            symbol_norm = normalize_symbol(symbol, exchange)
             def run_blocking_calls():
-                symbol_norm = normalize_symbol(symbol)
                 if not pair_exists(symbol_norm, exchange):
                     return f"❌ Pasangan `{symbol_norm}` tidak tersedia di {exchange.upper()}."
-                result = generate_trade_plan(symbol_norm, timeframe, exchange, forced_direction=direction, return_dict=True, ema_short=target_ema_short, ema_long=target_ema_long)
+                result = shared_trade_plan(symbol_norm, timeframe, exchange, direction, target_ema_short, target_ema_long)
                 return result
             
             try:
@@ -1512,8 +1691,7 @@ async def on_interaction(interaction):
                     await interaction.followup.send(result, ephemeral=True)
                     return
                 
-                symbol_norm = normalize_symbol(symbol, exchange)
-                chart_buf = await bot.loop.run_in_executor(None, generate_chart_from_data, result, symbol_norm, timeframe, exchange)
+                chart_buf = await render_chart(result, symbol_norm, timeframe, exchange)
                 
                 # Check if this is a scan result by looking at the current embed title
                 is_scan = "(Scanned)" in interaction.message.embeds[0].title if interaction.message.embeds else False
@@ -1525,8 +1703,7 @@ async def on_interaction(interaction):
                         await interaction.followup.send(f"❌ Could not generate scan result for {symbol} with EMA {target_ema_short}/{target_ema_long}", ephemeral=True)
                         return
                     
-                    symbol_norm = normalize_symbol(symbol, exchange)
-                    chart_buf = await bot.loop.run_in_executor(None, generate_chart_from_data, best_data, symbol_norm, best_timeframe, exchange)
+                    chart_buf = await render_chart(best_data, symbol_norm, best_timeframe, exchange)
                     
                     embed, view = create_scan_embed_from_dict(best_data, symbol_norm, best_timeframe, all_results, exchange, original_ema_short, original_ema_long, direction, user_id)
                 else:
@@ -1541,10 +1718,10 @@ async def on_interaction(interaction):
             except Exception as e:
                 await interaction.followup.send(f"Error updating signal: {e}", ephemeral=True)
 
+EMA_SKIP_KEYWORDS = frozenset(('detail', 'binance', 'bybit', 'bitget', 'gateio', 'gate', 'long', 'short'))
+
 def parse_ema_from_message(content):
     """Parse EMA values from message content"""
-    valid_tfs = ['1m','3m','5m','15m','30m','1h','2h','4h','6h','1d','1w','1M']
-    
     if content.startswith('$'):
         parts = content[1:].strip().split()
     elif content.startswith('!signal'):
@@ -1557,8 +1734,7 @@ def parse_ema_from_message(content):
         part_lower = part.lower()
         
         # Skip known keywords and timeframes
-        if (part_lower in ['detail', 'binance', 'bybit', 'bitget', 'gateio', 'gate', 'long', 'short'] or 
-            part_lower in valid_tfs):
+        if part_lower in EMA_SKIP_KEYWORDS or part_lower in VALID_TFS_LOWER:
             continue
         
         # Try to parse as EMA
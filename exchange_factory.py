@@ -3,11 +3,132 @@ Exchange Factory - Abstracts data fetching from different exchanges
 Supports: Bybit, Binance, Bitget, Gate.io
 """
 
+import importlib
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+
+import json
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # stdlib json still works, just slower on big payloads
+    orjson = None
+
 LOG_PREFIX = "[exchange_factory]"
 
+def json_loads(raw):
+    """Decode a JSON response body or cache file, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def json_dumps(obj) -> bytes:
+    """Encode to JSON bytes, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+# Trade plans the bot runs at once per exchange on the scan/scalp/ping paths
+# (discord_bot gates those jobs with a semaphore of this size)
+EXCHANGE_CONCURRENCY = 4
+# Gate requests that skip that gate: $/!signal, the EMA-switch buttons, pair
+# checks and coin lists
+GATE_UNGATED_CONNECTIONS = 4
+
+# Per-host connection pool sizes for the shared HTTP session. Each host gets its
+# own pool so exchanges never evict each other's keep-alive connections. Gate's
+# pool is smaller, sized for the gated scan jobs plus the ungated requests; with
+# pool_block=False a burst past it still connects, but the extra sockets are
+# dropped afterwards (urllib3 logs "Connection pool is full")
+HTTP_POOL_SIZES = {
+    'https://api.bybit.com': 20,
+    'https://api.bybitglobal.com': 20,
+    'https://fapi.binance.com': 20,
+    'https://api.bitget.com': 20,
+    'https://api.gateio.ws': EXCHANGE_CONCURRENCY + GATE_UNGATED_CONNECTIONS,
+}
+
+def _create_session():
+    """Build the one requests.Session shared by every exchange data module."""
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=5,  # Total retry attempts
+        backoff_factor=1,  # Wait 1s, 2s, 4s, 8s, 16s between retries
+        status_forcelist=[429, 500, 502, 503, 504],  # Retry on these status codes
+        allowed_methods=["GET"],  # Only retry GET requests
+        raise_on_status=False
+    )
+    default_adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=10,
+        pool_maxsize=20,
+        pool_block=False
+    )
+    session.mount("http://", default_adapter)
+    session.mount("https://", default_adapter)
+    for prefix, pool_size in HTTP_POOL_SIZES.items():
+        session.mount(prefix, HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            pool_block=False
+        ))
+    # Set reasonable timeouts
+    session.timeout = (10, 30)  # (connect timeout, read timeout)
+    return session
+
+_SHARED_SESSION = _create_session()
+
+def get_shared_session():
+    """Return the process-wide HTTP session used for all exchange requests."""
+    return _SHARED_SESSION
+
+# pair_exists results are cached per (symbol, exchange). A missing pair is only
+# remembered briefly, so a new listing or a lookup made during an exchange outage
+# is retried (with the module's forced pairs refresh) soon after
+PAIR_EXISTS_TTL = 3600  # 1 hour, same as the exchange pairs cache expiry
+PAIR_MISSING_TTL = 60  # seconds, same as gate_data's negative cache
+PAIR_EXISTS_MAXSIZE = 512
+_PAIR_EXISTS_CACHE = {}
+_PAIR_EXISTS_LOCK = threading.Lock()
+
+# Raw OHLC frames are reused for OHLC_CACHE_TTL seconds, never past the close of
+# the candle they were fetched in, so e.g. different EMA settings or long/short
+# plans for the same symbol share one download
+OHLC_CACHE_TTL = 20  # seconds
+OHLC_CACHE_MAXSIZE = 256
+TIMEFRAME_SECONDS = {
+    '1m': 60, '3m': 180, '5m': 300, '15m': 900, '30m': 1800,
+    '1h': 3600, '2h': 7200, '4h': 14400, '6h': 21600,
+    '1d': 86400, '1w': 604800,
+}
+# Candle boundaries not at a multiple of the period since the Unix epoch: the
+# epoch fell on a Thursday, but exchange weekly candles open Monday 00:00 UTC
+TIMEFRAME_OFFSETS = {'1w': 4 * 86400}
+_OHLC_CACHE = {}
+_OHLC_INFLIGHT = {}
+_OHLC_LOCK = threading.Lock()
+
+# Exchange name -> (data module, log line printed the first time it's resolved)
+EXCHANGE_MODULES = {
+    'binance': ('binance_data', "🟡 Using Binance Futures data source"),
+    'bybit': ('bybit_data', "🟠 Using Bybit Futures data source"),
+    'bitget': ('bitget_data', "🔵 Using Bitget Futures data source"),
+    'gateio': ('gate_data', "🟢 Using Gate.io Futures data source"),
+    'gate': ('gate_data', "🟢 Using Gate.io Futures data source"),
+}
+
+@lru_cache(maxsize=32)
 def get_exchange_module(exchange: str):
     """
     Get the appropriate exchange data module based on exchange name.
+    Resolved once per name; later calls are a cache hit with no import or log.
     
     Args:
         exchange: Exchange name ('bybit', 'binance', 'bitget', or 'gateio')
@@ -17,28 +138,25 @@ def get_exchange_module(exchange: str):
     """
     exchange = exchange.lower().strip()
     
-    if exchange == 'binance':
-        print(f"{LOG_PREFIX} 🟡 Using Binance Futures data source")
-        import binance_data
-        return binance_data
-    elif exchange == 'bybit':
-        print(f"{LOG_PREFIX} 🟠 Using Bybit Futures data source")
-        import bybit_data
-        return bybit_data
-    elif exchange == 'bitget':
-        print(f"{LOG_PREFIX} 🔵 Using Bitget Futures data source")
-        import bitget_data
-        return bitget_data
-    elif exchange in ('gateio', 'gate'):
-        print(f"{LOG_PREFIX} 🟢 Using Gate.io Futures data source")
-        import gate_data
-        return gate_data
-    else:
+    entry = EXCHANGE_MODULES.get(exchange)
+    if entry is None:
         print(f"{LOG_PREFIX} ⚠️ Unknown exchange '{exchange}', defaulting to Bybit")
-        import bybit_data
-        return bybit_data
+        entry = EXCHANGE_MODULES['bybit']
+    module_name, message = entry
+    print(f"{LOG_PREFIX} {message}")
+    return importlib.import_module(module_name)
 
-def fetch_ohlc(symbol: str, timeframe: str, exchange: str = 'bybit', limit: int = 500):
+def candle_aligned_expiry(timeframe: str, now: float, ttl: float) -> float:
+    """Expiry timestamp for data fetched now: ttl, capped at the current candle close"""
+    expires_at = now + ttl
+    tf_seconds = TIMEFRAME_SECONDS.get(timeframe)  # '1M' (month) is not aligned, TTL only
+    if tf_seconds:
+        offset = TIMEFRAME_OFFSETS.get(timeframe, 0)
+        candle_close = ((now - offset) // tf_seconds + 1) * tf_seconds + offset
+        expires_at = min(expires_at, candle_close)
+    return expires_at
+
+def fetch_ohlc(symbol: str, timeframe: str, exchange: str = 'bybit', limit: int = 500, use_cache: bool = True):
     """
     Fetch OHLC data from specified exchange.
     
@@ -47,16 +165,58 @@ def fetch_ohlc(symbol: str, timeframe: str, exchange: str = 'bybit', limit: int
         timeframe: Timeframe (e.g., '1h', '4h', '1d')
         exchange: Exchange name ('bybit', 'binance', 'bitget', or 'gateio'), default 'bybit'
         limit: Number of candles to fetch
+        use_cache: Serve a recent identical fetch from memory (False always downloads)
         
     Returns:
-        pandas.DataFrame with OHLC data
+        pandas.DataFrame with OHLC data, shared with the cache (treat it as read-only)
     """
+    key = (symbol, timeframe, exchange, limit)
+    if not use_cache:
+        return _download_ohlc(key)
+
+    with _OHLC_LOCK:
+        cached = _OHLC_CACHE.get(key)
+        if cached is not None and time.time() < cached[0]:
+            return cached[1]
+        # Threads asking for the same candles while a download is running wait
+        # for that download instead of starting their own
+        future = _OHLC_INFLIGHT.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _OHLC_INFLIGHT[key] = future
+    if not owner:
+        return future.result()
+
+    try:
+        df = _download_ohlc(key)
+        future.set_result(df)
+        return df
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _OHLC_LOCK:
+            del _OHLC_INFLIGHT[key]
+
+def _download_ohlc(key):
+    """Fetch from the exchange module and store the frame in the OHLC cache"""
+    symbol, timeframe, exchange, limit = key
     module = get_exchange_module(exchange)
-    return module.fetch_ohlc(symbol, timeframe, limit)
+    df = module.fetch_ohlc(symbol, timeframe, limit)
+    with _OHLC_LOCK:
+        _OHLC_CACHE.pop(key, None)
+        if len(_OHLC_CACHE) >= OHLC_CACHE_MAXSIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _OHLC_CACHE.pop(next(iter(_OHLC_CACHE)))
+        _OHLC_CACHE[key] = (candle_aligned_expiry(timeframe, time.time(), OHLC_CACHE_TTL), df)
+    return df
 
+@lru_cache(maxsize=4096)
 def normalize_symbol(symbol: str, exchange: str = 'bybit') -> str:
     """
     Normalize symbol to exchange format.
+    Results are memoized since this is a pure string transform.
     
     Args:
         symbol: Trading pair symbol
@@ -79,8 +239,22 @@ def pair_exists(symbol: str, exchange: str = 'bybit') -> bool:
     Returns:
         True if pair exists, False otherwise
     """
+    key = (symbol, exchange)
+    with _PAIR_EXISTS_LOCK:
+        cached = _PAIR_EXISTS_CACHE.get(key)
+    if cached is not None:
+        exists, checked_at = cached
+        ttl = PAIR_EXISTS_TTL if exists else PAIR_MISSING_TTL
+        if time.monotonic() - checked_at < ttl:
+            return exists
     module = get_exchange_module(exchange)
-    return module.pair_exists(symbol)
+    exists = module.pair_exists(symbol)
+    with _PAIR_EXISTS_LOCK:
+        if key not in _PAIR_EXISTS_CACHE and len(_PAIR_EXISTS_CACHE) >= PAIR_EXISTS_MAXSIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _PAIR_EXISTS_CACHE.pop(next(iter(_PAIR_EXISTS_CACHE)), None)
+        _PAIR_EXISTS_CACHE[key] = (exists, time.monotonic())
+    return exists
 
 def get_all_pairs(exchange: str = 'bybit', force_refresh: bool = False):
     """
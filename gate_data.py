@@ -1,78 +1,128 @@
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import pandas as pd
 import time
 import os
-import json
+import threading
+import tempfile
+from functools import lru_cache
 
-LOG_PREFIX = "[gate_data]"
+from exchange_factory import get_shared_session, json_dumps, json_loads
 
-# Create a session with retry strategy and connection pooling
-def _create_session():
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=5,  # Total retry attempts
-        backoff_factor=1,  # Wait 1s, 2s, 4s, 8s, 16s between retries
-        status_forcelist=[429, 500, 502, 503, 504],  # Retry on these status codes
-        allowed_methods=["GET"],  # Only retry GET requests
-        raise_on_status=False
-    )
-    adapter = HTTPAdapter(
-        max_retries=retry_strategy,
-        pool_connections=10,
-        pool_maxsize=20,
-        pool_block=False
-    )
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    # Set reasonable timeouts
-    session.timeout = (10, 30)  # (connect timeout, read timeout)
-    return session
+LOG_PREFIX = "[gate_data]"
 
-_SESSION = _create_session()
+# Connections are pooled in one session shared with the other exchanges
+_SESSION = get_shared_session()
 
 _PAIRS_CACHE = None
+_PAIRS_SET = frozenset()  # same pairs as _PAIRS_CACHE, for O(1) pair_exists lookups
+# ETag / Last-Modified of the contracts response behind _PAIRS_CACHE, sent on
+# refresh so an unchanged list comes back as a bodyless 304
+_PAIRS_VALIDATORS = {}
 CACHE_FILE = os.path.join(os.path.dirname(__file__), 'gate_pairs_cache.json')
 CACHE_EXPIRY = 3600  # 1 hour in seconds
+# Symbols that were still missing after a forced refresh are answered False for
+# this long, so repeated lookups of a typo don't re-download the contracts list
+NEGATIVE_CACHE_TTL = 60  # seconds
+NEGATIVE_CACHE_MAXSIZE = 512
+_NEG_CACHE = {}
+_NEG_CACHE_LOCK = threading.Lock()
 
 GATE_BASE_URL = 'https://api.gateio.ws/api/v4'  # Gate.io API v4
 
+# Gate.io interval mapping
+GATE_INTERVALS = {
+    '1m': '1m',
+    '3m': '3m',
+    '5m': '5m',
+    '15m': '15m',
+    '30m': '30m',
+    '1h': '1h',
+    '2h': '2h',
+    '4h': '4h',
+    '6h': '6h',
+    '12h': '12h',
+    '1d': '1d',
+    '1w': '1w'
+}
+# Candle count caps for longer timeframes
+GATE_LIMIT_CAPS = {
+    '1d': 365,  # Max 1 year for daily candles
+    '1w': 200,  # Max 200 candles for weekly
+}
+
+def _write_cache_atomic(payload: bytes):
+    """Write the pairs cache via a temp file + os.replace so a crash never leaves a truncated file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CACHE_FILE), prefix='.gate_pairs_', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, CACHE_FILE)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
 def _load_pairs_from_disk():
     try:
         if os.path.exists(CACHE_FILE):
-            with open(CACHE_FILE, 'r') as f:
-                data = json.load(f)
+            with open(CACHE_FILE, 'rb') as f:
+                data = json_loads(f.read())
                 if isinstance(data, dict) and 'pairs' in data and 'timestamp' in data:
                     current_time = time.time()
                     if current_time - data['timestamp'] < CACHE_EXPIRY:
                         print(f"{LOG_PREFIX} 📂 Loaded pairs from disk cache")
-                        return data['pairs']
+                        return data['pairs'], data.get('validators') or {}
         print(f"{LOG_PREFIX} 📂 No valid cache found on disk")
     except Exception as e:
         print(f"{LOG_PREFIX} 📂 Error loading cache from disk: {e}")
-    return None
+    return None, {}
+
+def _set_pairs_cache(pairs, validators=None):
+    global _PAIRS_CACHE, _PAIRS_SET, _PAIRS_VALIDATORS
+    _PAIRS_CACHE = pairs
+    _PAIRS_SET = frozenset(pairs)
+    _PAIRS_VALIDATORS = validators or {}
+    return _PAIRS_CACHE
 
 def get_all_pairs(force_refresh=False):
-    global _PAIRS_CACHE
     if _PAIRS_CACHE is not None and not force_refresh:
         print(f"{LOG_PREFIX} 💾 Using in-memory pairs cache")
         return _PAIRS_CACHE
-    disk = _load_pairs_from_disk()
+    disk, disk_validators = _load_pairs_from_disk()
     if disk and not force_refresh:
-        _PAIRS_CACHE = disk
         print(f"{LOG_PREFIX} 💾 Using disk pairs cache")
-        return _PAIRS_CACHE
+        return _set_pairs_cache(disk, disk_validators)
     
     print(f"{LOG_PREFIX} 🌐 Fetching pairs from Gate.io Futures API")
     pairs = []
+    seen = set()
+    validators = {}
+    
+    # Revalidate the pairs we already hold instead of re-downloading them
+    headers = {}
+    if _PAIRS_CACHE:
+        if _PAIRS_VALIDATORS.get('etag'):
+            headers['If-None-Match'] = _PAIRS_VALIDATORS['etag']
+        if _PAIRS_VALIDATORS.get('last_modified'):
+            headers['If-Modified-Since'] = _PAIRS_VALIDATORS['last_modified']
     
     try:
         # Gate.io API endpoint for USDT perpetual futures contracts
         url = f"{GATE_BASE_URL}/futures/usdt/contracts"
-        resp = _SESSION.get(url, timeout=(10, 30))
-        resp.raise_for_status()
-        data = resp.json()
+        resp = _SESSION.get(url, headers=headers, timeout=(10, 30))
+        if resp.status_code == 304:
+            print(f"{LOG_PREFIX} 📊 Gate.io contracts unchanged (304), keeping {len(_PAIRS_CACHE)} cached pairs")
+            pairs = _PAIRS_CACHE
+            validators = _PAIRS_VALIDATORS
+            data = []
+        else:
+            resp.raise_for_status()
+            data = json_loads(resp.content)
+            validators = {
+                'etag': resp.headers.get('ETag'),
+                'last_modified': resp.headers.get('Last-Modified'),
+            }
         
         # Gate.io returns array of contract objects
         for contract in data:
@@ -83,60 +133,74 @@ def get_all_pairs(force_refresh=False):
                 if name.endswith('_USDT') and contract.get('type') == 'direct':
                     # Convert BTC_USDT to BTCUSDT for consistency
                     symbol = name.replace('_', '')
-                    if symbol not in pairs:
+                    if symbol not in seen:
+                        seen.add(symbol)
                         pairs.append(symbol)
         
-        print(f"{LOG_PREFIX} 📊 Fetched {len(pairs)} trading pairs from Gate.io Futures")
+        if data:
+            print(f"{LOG_PREFIX} 📊 Fetched {len(pairs)} trading pairs from Gate.io Futures")
     except Exception as e:
         print(f"{LOG_PREFIX} ❌ Error fetching pairs from Gate.io: {e}")
     
     if pairs:
-        _PAIRS_CACHE = pairs
+        _set_pairs_cache(pairs, validators)
         try:
             cache_data = {
                 'pairs': pairs,
-                'timestamp': time.time()
+                'timestamp': time.time(),
+                'validators': validators
             }
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(cache_data, f)
+            _write_cache_atomic(json_dumps(cache_data))
             print(f"{LOG_PREFIX} 💾 Saved pairs to disk cache")
         except Exception as e:
             print(f"{LOG_PREFIX} ❌ Error saving cache to disk: {e}")
         return _PAIRS_CACHE
     
-    _PAIRS_CACHE = disk or []
     print(f"{LOG_PREFIX} ⚠️ No pairs fetched, using fallback cache")
-    return _PAIRS_CACHE
+    return _set_pairs_cache(disk or [])
 
+# Separators dropped from user input in one translate pass
+_SYMBOL_STRIP_TABLE = str.maketrans('', '', '-/_')
+
+@lru_cache(maxsize=4096)
 def normalize_symbol(symbol: str) -> str:
     """Normalize symbol to Gate.io format (BTC_USDT)"""
-    s = (symbol or '').strip().upper().replace('-', '').replace('/', '').replace('_', '')
+    s = (symbol or '').strip().upper().translate(_SYMBOL_STRIP_TABLE)
     if not s.endswith('USDT'):
         s = s + 'USDT'
     # Gate.io uses underscore format for API calls
     # Convert BTCUSDT to BTC_USDT
-    if s.endswith('USDT') and '_' not in s:
-        base = s[:-4]  # Remove USDT
-        s = f"{base}_USDT"
-    return s
+    return f"{s[:-4]}_USDT"
 
 def pair_exists(symbol: str) -> bool:
     symbol_normalized = normalize_symbol(symbol)
     # For comparison with cache, remove underscore
     symbol_no_underscore = symbol_normalized.replace('_', '')
     print(f"{LOG_PREFIX} 🔍 Checking if {symbol_normalized} exists in cache")
-    pairs = get_all_pairs()
-    if symbol_no_underscore in pairs:
+    get_all_pairs()
+    if symbol_no_underscore in _PAIRS_SET:
         print(f"{LOG_PREFIX} ✅ {symbol_normalized} found in cache")
         return True
+    with _NEG_CACHE_LOCK:
+        missed_at = _NEG_CACHE.get(symbol_no_underscore)
+    if missed_at is not None and time.monotonic() - missed_at < NEGATIVE_CACHE_TTL:
+        print(f"{LOG_PREFIX} ❌ {symbol_normalized} recently not found, skipping refresh")
+        return False
     # Not found in cache, force refresh from API with retry
     print(f"{LOG_PREFIX} 🔄 Refreshing pairs cache for {symbol_normalized}...")
     max_attempts = 3
     for attempt in range(max_attempts):
         try:
-            pairs = get_all_pairs(force_refresh=True)
-            found = symbol_no_underscore in pairs
+            get_all_pairs(force_refresh=True)
+            found = symbol_no_underscore in _PAIRS_SET
             print(f"{LOG_PREFIX} ✅ Cache refreshed. {symbol_normalized} found: {found}")
+            with _NEG_CACHE_LOCK:
+                _NEG_CACHE.pop(symbol_no_underscore, None)
+                if not found:
+                    if len(_NEG_CACHE) >= NEGATIVE_CACHE_MAXSIZE:
+                        # Evict the oldest entry (dicts keep insertion order)
+                        _NEG_CACHE.pop(next(iter(_NEG_CACHE)), None)
+                    _NEG_CACHE[symbol_no_underscore] = time.monotonic()
             return found
         except Exception as e:
             if attempt < max_attempts - 1:
@@ -152,33 +216,16 @@ def fetch_ohlc(symbol: str, timeframe: str, limit: int = 500):
     symbol_normalized = normalize_symbol(symbol)
     print(f"{LOG_PREFIX} 📈 Fetching OHLC for {symbol_normalized} {timeframe}")
     
-    # Gate.io interval mapping
-    tf_map = {
-        '1m': '1m',
-        '3m': '3m',
-        '5m': '5m',
-        '15m': '15m',
-        '30m': '30m',
-        '1h': '1h',
-        '2h': '2h',
-        '4h': '4h',
-        '6h': '6h',
-        '12h': '12h',
-        '1d': '1d',
-        '1w': '1w'
-    }
-    
-    interval = tf_map.get(timeframe.lower())
+    tf = timeframe.lower()
+    interval = GATE_INTERVALS.get(tf)
     if not interval:
         print(f"{LOG_PREFIX} ❌ Invalid timeframe: {timeframe}")
         raise ValueError(f"Invalid timeframe {timeframe}")
     
     # Adjust limit for longer timeframes
-    if timeframe.lower() == '1d':
-        limit = min(limit, 365)  # Max 1 year for daily candles
-        print(f"{LOG_PREFIX} ⚙️ Adjusted limit to {limit} for {timeframe} timeframe")
-    elif timeframe.lower() in ['1w']:
-        limit = min(limit, 200)  # Max 200 candles for weekly
+    cap = GATE_LIMIT_CAPS.get(tf)
+    if cap is not None:
+        limit = min(limit, cap)
         print(f"{LOG_PREFIX} ⚙️ Adjusted limit to {limit} for {timeframe} timeframe")
     
     # Gate.io API endpoint for candlesticks
@@ -189,20 +236,17 @@ def fetch_ohlc(symbol: str, timeframe: str, limit: int = 500):
         'limit': limit
     }
     
-    print(f"{LOG_PREFIX} 🔍 DEBUG - Request parameters:")
-    print(f"{LOG_PREFIX}   - contract: {symbol_normalized}")
-    print(f"{LOG_PREFIX}   - interval: {interval}")
-    print(f"{LOG_PREFIX}   - limit: {limit}")
-    
     try:
         resp = _SESSION.get(url, params=params, timeout=(10, 30))
         
-        # Print response before raising error
-        print(f"{LOG_PREFIX} 📥 Response status: {resp.status_code}")
-        print(f"{LOG_PREFIX} 📥 Response body: {resp.text[:500]}")  # First 500 chars
+        # Only dump the request and response when Gate rejects it; decoding the
+        # body text on every successful fetch is wasted work
+        if not resp.ok:
+            print(f"{LOG_PREFIX} 📥 Response status: {resp.status_code} for {params}")
+            print(f"{LOG_PREFIX} 📥 Response body: {resp.text[:500]}")  # First 500 chars
         
         resp.raise_for_status()
-        data = resp.json()
+        data = json_loads(resp.content)
         
         if not data:
             print(f"{LOG_PREFIX} ⚠️ No candle data returned for {symbol_normalized}")
@@ -254,7 +298,7 @@ def get_last_price_from_rest(symbol: str):
         url = f"{GATE_BASE_URL}/futures/usdt/contracts/{symbol_normalized}"
         resp = _SESSION.get(url, timeout=(10, 30))
         resp.raise_for_status()
-        data = resp.json()
+        data = json_loads(resp.content)
         
         # Gate.io returns contract info with last price
         last_price = float(data.get('last_price', 0))
@@ -1,71 +1,152 @@
+import math
+import threading
 import pandas as pd
-import ta
 import numpy as np
 from exchange_factory import fetch_ohlc, normalize_symbol
-from utils import calculate_rr, format_price_dynamic
+from utils import calculate_rr, format_price_dynamic, VERBOSE_LOGS
 
 LOG_PREFIX = "[signal_logic]"
 
+# ------------------------------
+# Helper: indicators
+# ------------------------------
+# Plain pandas/NumPy versions of the `ta` indicators the plan uses. Each matches
+# the ta formula (same smoothing, warm-up NaNs/zeros) without building indicator
+# objects and their intermediate Series.
+def ema_series(close: pd.Series, period: int) -> pd.Series:
+    """
+    Full-history EMA in a single compiled ewm pass.
+    Same values as ta.trend.EMAIndicator (adjust=False, NaN until `period` bars)
+    without building an indicator object per call.
+    """
+    return close.ewm(span=period, min_periods=period, adjust=False).mean()
+
+def rsi_series(close: pd.Series, window: int = 14) -> pd.Series:
+    """Wilder RSI, same as ta.momentum.RSIIndicator"""
+    diff = close.diff(1)
+    # where() (not clip) so the leading NaN diff counts as 0, as in ta
+    up = diff.where(diff > 0, 0.0)
+    down = -diff.where(diff < 0, 0.0)
+    emaup = up.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    emadn = down.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    rsi = np.where(emadn == 0, 100, 100 - (100 / (1 + emaup / emadn)))
+    return pd.Series(rsi, index=close.index)
+
+def atr_series(high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14) -> pd.Series:
+    """
+    Wilder ATR, same as ta.volatility.AverageTrueRange: zeros during warm-up, SMA
+    of the first `window` true ranges as the seed, then Wilder smoothing (as an ewm
+    instead of ta's per-row Python loop).
+    """
+    h = high.to_numpy(dtype=float)
+    l = low.to_numpy(dtype=float)
+    prev_close = close.shift(1).to_numpy(dtype=float)
+    # fmax skips the NaN previous close on the first bar, like ta's row-wise max
+    true_range = np.fmax(h - l, np.fmax(np.abs(h - prev_close), np.abs(l - prev_close)))
+    atr = np.zeros(len(true_range))
+    if len(true_range) >= window:
+        seeded = true_range[window - 1:].copy()
+        seeded[0] = true_range[:window].mean()
+        atr[window - 1:] = pd.Series(seeded).ewm(alpha=1 / window, adjust=False).mean().to_numpy()
+    return pd.Series(atr, index=close.index)
+
+def macd_lines(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9):
+    """MACD line and signal line, same as ta.trend.MACD"""
+    macd_line = ema_series(close, fast) - ema_series(close, slow)
+    return macd_line, ema_series(macd_line, signal)
+
+def stoch_lines(high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14, smooth_window: int = 3):
+    """Stochastic %K and %D, same as ta.momentum.StochasticOscillator"""
+    smin = low.rolling(window, min_periods=window).min()
+    smax = high.rolling(window, min_periods=window).max()
+    stoch_k = 100 * (close - smin) / (smax - smin)
+    return stoch_k, stoch_k.rolling(smooth_window, min_periods=smooth_window).mean()
+
 # ------------------------------
 # Helper: FVG / SMC detection
 # ------------------------------
+def _fvg_arrays(df: pd.DataFrame):
+    """Bullish/bearish gap masks plus zone bounds and midpoints, one entry per candle from the third on."""
+    highs = df['high'].to_numpy()
+    lows = df['low'].to_numpy()
+    # Compare each candle with the one two bars back (c1 = i-2, c3 = i) in one pass
+    c1_high, c1_low = highs[:-2], lows[:-2]
+    c3_high, c3_low = highs[2:], lows[2:]
+    bullish = c3_low > c1_high
+    bearish = ~bullish & (c3_high < c1_low)
+    zone_high = np.where(bullish, c3_low, c1_low)
+    zone_low = np.where(bullish, c1_high, c3_high)
+    return bullish, bearish, zone_high, zone_low, (zone_high + zone_low) / 2
+
+def _fvg_entry(bullish, zone_high, zone_low, level, j):
+    return {
+        'type': 'Bullish' if bullish[j] else 'Bearish',
+        'high': zone_high[j],
+        'low': zone_low[j],
+        'level': level[j],
+        'bar_index': int(j) + 2
+    }
+
 def detect_fvg(df: pd.DataFrame):
-    print(f"{LOG_PREFIX} 🔍 Detecting FVGs in {len(df)} candles")
-    fvg_data = []
-    for i in range(2, len(df)):
-        c1 = df.iloc[i-2]
-        c3 = df.iloc[i]
-        # Bullish FVG
-        if c3['low'] > c1['high']:
-            fvg_level = (c3['low'] + c1['high']) / 2
-            fvg_data.append({
-                'type': 'Bullish',
-                'high': c3['low'],
-                'low': c1['high'],
-                'level': fvg_level,
-                'bar_index': i
-            })
-        # Bearish FVG
-        elif c3['high'] < c1['low']:
-            fvg_level = (c1['low'] + c3['high']) / 2
-            fvg_data.append({
-                'type': 'Bearish',
-                'high': c1['low'],
-                'low': c3['high'],
-                'level': fvg_level,
-                'bar_index': i
-            })
-    print(f"{LOG_PREFIX} ✅ Detected {len(fvg_data)} FVGs")
-    return fvg_data
-
-def find_smc_levels(df: pd.DataFrame, fvgs: list, direction: str):
-    print(f"{LOG_PREFIX} 🔍 Finding SMC levels for direction: {direction}")
-    last_candle = df.iloc[-1]
+    """All FVGs in df, oldest first (kept for callers outside find_smc_levels)"""
+    return detect_fvg_and_pick(df, 'long', 0.0, return_all=True)[1]
+
+def detect_fvg_and_pick(df: pd.DataFrame, direction: str, last_close: float, return_all: bool = False):
+    """
+    Detect FVGs and pick the one of the trade's side closest to last_close in the same pass.
+    The full FVG list is only built when return_all is set (chart rendering needs it).
+
+    Returns:
+        (relevant_fvg or None, list of all FVGs or None)
+    """
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} 🔍 Detecting FVGs in {len(df)} candles")
+    bullish, bearish, zone_high, zone_low, level = _fvg_arrays(df)
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} ✅ Detected {int(np.count_nonzero(bullish | bearish))} FVGs")
+
+    target_type = 'Bullish' if direction == 'long' else 'Bearish'
+    candidates = np.flatnonzero(bullish if direction == 'long' else bearish)
     relevant_fvg = None
-    if fvgs:
-        target_type = 'Bullish' if direction == 'long' else 'Bearish'
-        filtered = [f for f in fvgs if f['type'] == target_type]
-        if filtered:
-            relevant_fvg = min(filtered, key=lambda f: abs(f['level'] - last_candle['close']))
+    if len(candidates):
+        # argmin keeps the earliest gap on ties, like min() over the list did
+        j = candidates[np.argmin(np.abs(level[candidates] - last_close))]
+        relevant_fvg = _fvg_entry(bullish, zone_high, zone_low, level, j)
+        if VERBOSE_LOGS:
             print(f"{LOG_PREFIX} ✅ Found relevant FVG: {relevant_fvg['type']} at level {relevant_fvg['level']:.6f}")
-        else:
+    elif VERBOSE_LOGS:
+        if bullish.any() or bearish.any():
             print(f"{LOG_PREFIX} ⚠️ No {target_type} FVGs found")
-    else:
-        print(f"{LOG_PREFIX} ⚠️ No FVGs available for SMC analysis")
+        else:
+            print(f"{LOG_PREFIX} ⚠️ No FVGs available for SMC analysis")
+
+    fvgs = None
+    if return_all:
+        fvgs = [_fvg_entry(bullish, zone_high, zone_low, level, j)
+                for j in np.flatnonzero(bullish | bearish)]
+    return relevant_fvg, fvgs
+
+def find_smc_levels(df: pd.DataFrame, direction: str, return_all: bool = False):
+    """Returns (ob_high, ob_low, relevant_fvg, fvgs); fvgs is None unless return_all is set."""
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} 🔍 Finding SMC levels for direction: {direction}")
+    relevant_fvg, fvgs = detect_fvg_and_pick(df, direction, df['close'].iat[-1], return_all)
     
     ob_high, ob_low = None, None
     if relevant_fvg:
         ob_idx = relevant_fvg['bar_index'] - 2
         if ob_idx >= 0:
-            ob_candle = df.iloc[ob_idx]
-            ob_high = ob_candle['high']
-            ob_low = ob_candle['low']
-            print(f"{LOG_PREFIX} 📊 Order Block: high={ob_high:.6f}, low={ob_low:.6f}")
+            ob_high = df['high'].iat[ob_idx]
+            ob_low = df['low'].iat[ob_idx]
+            if VERBOSE_LOGS:
+                print(f"{LOG_PREFIX} 📊 Order Block: high={ob_high:.6f}, low={ob_low:.6f}")
         else:
-            print(f"{LOG_PREFIX} ⚠️ Order Block index out of range: {ob_idx}")
+            if VERBOSE_LOGS:
+                print(f"{LOG_PREFIX} ⚠️ Order Block index out of range: {ob_idx}")
     
-    print(f"{LOG_PREFIX} ✅ SMC analysis complete")
-    return ob_high, ob_low, relevant_fvg
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} ✅ SMC analysis complete")
+    return ob_high, ob_low, relevant_fvg, fvgs
 
 # ------------------------------
 # Confidence scoring
@@ -79,7 +160,8 @@ def calculate_confidence_score(direction,
                                relevant_fvg, ob_high, ob_low,
                                entry_price, current_price,
                                ema_short=13, ema_long=21):
-    print(f"{LOG_PREFIX} 📊 Calculating confidence score for {direction} direction")
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} 📊 Calculating confidence score for {direction} direction")
     score = 0
     reasons = []
 
@@ -214,77 +296,131 @@ def calculate_confidence_score(direction,
     else:
         label = "VERY LOW 🚨"
 
-    print(f"{LOG_PREFIX} ✅ Confidence score calculated: {score}% {label}")
-    print(f"{LOG_PREFIX} 📋 Reasons: {', '.join(reasons)}")
+    print(f"{LOG_PREFIX} ✅ Confidence score calculated: {score}% ({len(reasons)} factors) {label}")
     return score, label, reasons
 
 # ------------------------------
 # Main: generate_trade_plan with optional forced_direction
 # ------------------------------
+# Indicator frames keyed by (symbol, timeframe, exchange, EMAs, OHLC identity);
+# a new candle or a changed live candle produces a new key
+INDICATOR_CACHE_MAXSIZE = 64
+_INDICATOR_CACHE = {}
+_INDICATOR_LOCK = threading.Lock()
+
 VALID_TFS = ['1m','3m','5m','15m','30m','1h','2h','4h','6h','1d','1w','1M']
+VALID_TFS_LOWER = frozenset(t.lower() for t in VALID_TFS)
 
-def generate_trade_plan(symbol: str, timeframe: str, exchange: str='bybit', forced_direction: str = None, return_dict: bool = False, ema_short: int = 13, ema_long: int = 21):
+def generate_trade_plan(symbol: str, timeframe: str, exchange: str='bybit', forced_direction: str = None, return_dict: bool = False, ema_short: int = 13, ema_long: int = 21, fresh_data: bool = False):
     """
     forced_direction: None | 'long' | 'short'
     return_dict: If True, return dict with all data; if False, return formatted string (backward compatible)
     ema_short: Short EMA period (default 13)
     ema_long: Long EMA period (default 21)
+    fresh_data: If True, bypass the short-lived OHLC cache and always download
     """
     print(f"{LOG_PREFIX} 🚀 Starting trade plan generation for {symbol} {timeframe} (forced: {forced_direction}, ema: {ema_short}/{ema_long})")
-    
+    df = _indicator_frame(symbol, timeframe, exchange, ema_short, ema_long, fresh_data)
+    return _plan_from_frame(df, exchange, forced_direction, return_dict, ema_short, ema_long)
+
+def generate_trade_plans_both(symbol: str, timeframe: str, exchange: str='bybit', ema_short: int = 13, ema_long: int = 21):
+    """
+    Long and short plans (dict format) for one timeframe from a single OHLC fetch
+    and indicator pass. Returns {'long': dict, 'short': dict}; each dict is the same
+    as generate_trade_plan(..., forced_direction=<side>, return_dict=True).
+    """
+    print(f"{LOG_PREFIX} 🚀 Starting long+short trade plan generation for {symbol} {timeframe} (ema: {ema_short}/{ema_long})")
+    df = _indicator_frame(symbol, timeframe, exchange, ema_short, ema_long)
+    return {side: _plan_from_frame(df, exchange, side, True, ema_short, ema_long) for side in ('long', 'short')}
+
+def _indicator_frame(symbol: str, timeframe: str, exchange: str, ema_short: int, ema_long: int, fresh_data: bool = False) -> pd.DataFrame:
+    """Fetch OHLC for symbol/timeframe and add every indicator column the plan reads"""
     symbol = normalize_symbol(symbol, exchange)
     # timeframe validation is expected upstream (discord bot), but keep friendly check
-    if timeframe.lower() not in [t.lower() for t in VALID_TFS]:
+    if timeframe.lower() not in VALID_TFS_LOWER:
         print(f"{LOG_PREFIX} ⚠️ Invalid timeframe: {timeframe}")
         raise ValueError(f"Timeframe {timeframe} tidak valid. Pilih salah satu {VALID_TFS}")
 
-    print(f"{LOG_PREFIX} 📊 Fetching OHLC data for {symbol} from {exchange.upper()}")
-    df = fetch_ohlc(symbol, timeframe, exchange)
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} 📊 Fetching OHLC data for {symbol} from {exchange.upper()}")
+    df = fetch_ohlc(symbol, timeframe, exchange, use_cache=not fresh_data)
     if df is None or df.empty or len(df) < 50:
         print(f"{LOG_PREFIX} ❌ Insufficient OHLC data: {len(df) if df is not None else 0} candles")
         raise ValueError("Gagal mengambil data OHLC yang cukup (perlu minimal 50 candle)")
 
-    print(f"{LOG_PREFIX} 📈 Calculating technical indicators with EMA periods: {ema_short}/{ema_long}")
-    # Indicators
-    df['ema13'] = ta.trend.EMAIndicator(df['close'], window=ema_short).ema_indicator()
-    df['ema21'] = ta.trend.EMAIndicator(df['close'], window=ema_long).ema_indicator()
-    df['rsi'] = ta.momentum.RSIIndicator(df['close'], window=14).rsi()
-    df['atr'] = ta.volatility.AverageTrueRange(df['high'], df['low'], df['close'], window=14).average_true_range()
-
-    macd_data = ta.trend.MACD(df['close'])
-    df['macd_line'] = macd_data.macd()
-    df['macd_signal'] = macd_data.macd_signal()
+    # The same OHLC (e.g. a cached download reused for long/short or the EMA
+    # switch) gets the same indicators, so reuse the frame built for it last time
+    key = _indicator_cache_key(symbol, timeframe, exchange, ema_short, ema_long, df)
+    if not fresh_data:
+        with _INDICATOR_LOCK:
+            cached = _INDICATOR_CACHE.get(key)
+        if cached is not None:
+            if VERBOSE_LOGS:
+                print(f"{LOG_PREFIX} 💾 Reusing indicator frame for {symbol} {timeframe}")
+            return cached
+
+    df = _add_indicators(df, ema_short, ema_long)
+    with _INDICATOR_LOCK:
+        _INDICATOR_CACHE.pop(key, None)
+        if len(_INDICATOR_CACHE) >= INDICATOR_CACHE_MAXSIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _INDICATOR_CACHE.pop(next(iter(_INDICATOR_CACHE)))
+        _INDICATOR_CACHE[key] = df
+    return df
+
+def _indicator_cache_key(symbol, timeframe, exchange, ema_short, ema_long, df):
+    """Identify an OHLC frame by its length and full last candle (time, OHLCV)"""
+    last = tuple(df.iloc[-1].tolist())
+    return (symbol, timeframe.lower(), exchange.lower(), ema_short, ema_long, len(df), last)
+
+def _add_indicators(df: pd.DataFrame, ema_short: int, ema_long: int) -> pd.DataFrame:
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} 📈 Calculating technical indicators with EMA periods: {ema_short}/{ema_long}")
+    # Indicators are collected first and attached in a single assign() so the
+    # frame's blocks are rebuilt once instead of once per column
+    close = df['close']
+    cols = {
+        'ema13': ema_series(close, ema_short),
+        'ema21': ema_series(close, ema_long),
+        'rsi': rsi_series(close, window=14),
+        'atr': atr_series(df['high'], df['low'], close, window=14),
+    }
+    cols['macd_line'], cols['macd_signal'] = macd_lines(close)
 
     # Stochastic (14,3)
     try:
-        stoch = ta.momentum.StochasticOscillator(df['high'], df['low'], df['close'], window=14, smooth_window=3)
-        df['stoch_k'] = stoch.stoch()
-        df['stoch_d'] = stoch.stoch_signal()
+        cols['stoch_k'], cols['stoch_d'] = stoch_lines(df['high'], df['low'], close, window=14, smooth_window=3)
     except Exception:
-        df['stoch_k'] = np.nan
-        df['stoch_d'] = np.nan
+        cols['stoch_k'] = np.nan
+        cols['stoch_d'] = np.nan
 
     # Volume EMA20
-    if 'volume' not in df.columns:
-        df['volume'] = 0.0
-    df['vol_ema20'] = df['volume'].ewm(span=20, adjust=False).mean()
-
-    last = df.iloc[-1]
-    sym = symbol.upper()
-    current_price = float(last['close'])
-    print(f"{LOG_PREFIX} 💰 Current price: {current_price}")
+    volume = df['volume'] if 'volume' in df.columns else pd.Series(0.0, index=df.index)
+    cols['volume'] = volume
+    cols['vol_ema20'] = volume.ewm(span=20, adjust=False).mean()
+    return df.assign(**cols)
+
+# Last-row columns read by _plan_from_frame, in unpacking order
+PLAN_COLUMNS = ['close', 'ema13', 'ema21', 'atr', 'rsi', 'macd_line', 'macd_signal',
+                'stoch_k', 'stoch_d', 'vol_ema20', 'volume']
+
+def _plan_from_frame(df: pd.DataFrame, exchange: str, forced_direction: str, return_dict: bool, ema_short: int, ema_long: int):
+    """Direction, levels, confidence and output for a frame built by _indicator_frame"""
+    # Pull every value the plan reads from the last row in one positional access
+    (current_price, ema13, ema21, atr, rsi_val, macd_line, macd_signal,
+     stoch_k, stoch_d, vol_ema20, current_vol) = (
+        float(v) for v in df[PLAN_COLUMNS].to_numpy(dtype=float)[-1]
+    )
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} 💰 Current price: {current_price}")
 
     # Values
-    ema13 = float(last['ema13'])
-    ema21 = float(last['ema21'])
-    atr = float(last['atr']) if not pd.isna(last['atr']) and float(last['atr']) > 0 else abs(current_price * 0.002)
-    rsi_val = float(last['rsi'])
-    macd_line = float(last['macd_line'])
-    macd_signal = float(last['macd_signal'])
-    stoch_k = float(last['stoch_k']) if not pd.isna(last.get('stoch_k', np.nan)) else None
-    stoch_d = float(last['stoch_d']) if not pd.isna(last.get('stoch_d', np.nan)) else None
-    vol_ema20 = float(last['vol_ema20']) if not pd.isna(last['vol_ema20']) and last['vol_ema20'] > 0 else None
-    current_vol = float(last['volume']) if 'volume' in last and not pd.isna(last['volume']) else None
+    if math.isnan(atr) or atr <= 0:
+        atr = abs(current_price * 0.002)
+    stoch_k = None if math.isnan(stoch_k) else stoch_k
+    stoch_d = None if math.isnan(stoch_d) else stoch_d
+    vol_ema20 = None if math.isnan(vol_ema20) or vol_ema20 <= 0 else vol_ema20
+    current_vol = None if math.isnan(current_vol) else current_vol
     vol_ratio = None
     if vol_ema20 and current_vol is not None and vol_ema20 > 0:
         vol_ratio = current_vol / vol_ema20
@@ -301,14 +437,8 @@ def generate_trade_plan(symbol: str, timeframe: str, exchange: str='bybit', forc
     # Apply forced direction override if provided and valid
     if forced_direction and forced_direction.lower() in ('long', 'short'):
         direction = forced_direction.lower()
-        print(f"{LOG_PREFIX} 🔄 Applied forced direction: {direction}")
-
-    # FVG/OB detection
-    fvgs = detect_fvg(df)
-    ob_high, ob_low, relevant_fvg = find_smc_levels(df, fvgs, direction)
-
-    # Prepare entry/stop/tp
-    sl_buffer = atr * 0.2
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} 🔄 Applied forced direction: {direction}")
 
     if direction == 'neutral':
         indicators_insight = (
@@ -340,6 +470,12 @@ def generate_trade_plan(symbol: str, timeframe: str, exchange: str='bybit', forc
             f"INSIGHT_START\n{indicators_insight}\nINSIGHT_END"
         )
 
+    # FVG/OB detection (neutral plans return above without needing it)
+    ob_high, ob_low, relevant_fvg, fvgs = find_smc_levels(df, direction, return_all=return_dict)
+
+    # Prepare entry/stop/tp
+    sl_buffer = atr * 0.2
+
     if direction == 'long':
         if relevant_fvg and ob_low:
             entry_price = relevant_fvg['low']
@@ -353,7 +489,7 @@ def generate_trade_plan(symbol: str, timeframe: str, exchange: str='bybit', forc
             stop = entry_price - atr * 2
             risk = abs(entry_price - stop)
 
-        lookback_high = df.iloc[-50:]['high'].max()
+        lookback_high = df['high'].to_numpy()[-50:].max()
         if lookback_high > (entry_price + risk * 1.5):
             tp2 = lookback_high
         else:
@@ -372,7 +508,7 @@ def generate_trade_plan(symbol: str, timeframe: str, exchange: str='bybit', forc
             stop = entry_price + atr * 2
             risk = abs(entry_price - stop)
 
-        lookback_low = df.iloc[-50:]['low'].min()
+        lookback_low = df['low'].to_numpy()[-50:].min()
         if lookback_low < (entry_price - risk * 1.5):
             tp2 = lookback_low
         else:
@@ -392,7 +528,7 @@ def generate_trade_plan(symbol: str, timeframe: str, exchange: str='bybit', forc
 
     # Build insight (kept for internal use but may be hidden in embed)
     ob_desc = "Ditemukan" if relevant_fvg else "Tidak ditemukan"
-    reason_text = "\n".join(f"- {reason}" for reason in reasons)
+    reason_text = "- " + "\n- ".join(reasons) if reasons else ""
 
     indicators_insight = (
         f"**📊 Indikator Teknis:**\n"
@@ -415,7 +551,8 @@ def generate_trade_plan(symbol: str, timeframe: str, exchange: str='bybit', forc
 
     # Return dict or string based on parameter
     if return_dict:
-        print(f"{LOG_PREFIX} ✅ Returning dict format for {direction.upper()} signal")
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} ✅ Returning dict format for {direction.upper()} signal")
         return {
             'direction': direction.upper(),
             'entry': entry_price,
@@ -445,7 +582,8 @@ def generate_trade_plan(symbol: str, timeframe: str, exchange: str='bybit', forc
         }
     
     # Final return string (same format as before - backward compatible)
-    print(f"{LOG_PREFIX} ✅ Returning string format for {direction.upper()} signal")
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} ✅ Returning string format for {direction.upper()} signal")
     return (
         f"DIRECTION: **{direction.upper()}**\n"
         f"ENTRY: {entry_price}\n"
@@ -1,7 +1,15 @@
+import os
 import re
 import math
 
 LOG_PREFIX = "[utils]"
+# BOT_VERBOSE_LOGS gates per-step trace lines across the bot (imported by the
+# other modules); errors and failures are always printed
+VERBOSE_LOGS = os.environ.get('BOT_VERBOSE_LOGS', 'false').strip().lower() in ('1', 'true', 'yes')
+
+# TP values inside a multi-line plan string ("TP1: 1.23\nTP2: 4.56")
+_TP2_RE = re.compile(r'TP2:\s*([\d.]+)')
+_TP1_RE = re.compile(r'TP1:\s*([\d.]+)')
 
 def calculate_rr(entry, stop, tp):
     """
@@ -9,59 +17,68 @@ def calculate_rr(entry, stop, tp):
     tp (Take Profit) harus berupa string multi-baris (TP1/TP2) atau nilai float/int.
     Kita akan menghitung RR terhadap TP2 (atau TP1 jika TP2 tidak ada).
     """
-    print(f"{LOG_PREFIX} 📊 Calculating RR - Entry: {entry}, Stop: {stop}, TP: {tp}")
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} 📊 Calculating RR - Entry: {entry}, Stop: {stop}, TP: {tp}")
     
     try:
         entry = float(entry)
         stop = float(stop)
-        print(f"{LOG_PREFIX} ✅ Converted entry/stop to float: {entry}/{stop}")
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} ✅ Converted entry/stop to float: {entry}/{stop}")
     except Exception as e:
         print(f"{LOG_PREFIX} ❌ Failed to convert entry/stop to float: {e}")
         return None
     
     risk = abs(entry - stop)
     if risk < 1e-8: # Jika risiko sangat mendekati nol
-        print(f"{LOG_PREFIX} ⚠️ Risk too small: {risk}")
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} ⚠️ Risk too small: {risk}")
         return None
 
     tp_val = None
     if isinstance(tp, str):
-        print(f"{LOG_PREFIX} 📝 Processing TP as string")
-        # Mencari TP2: di belakang 'TP2:'
-        match = re.search(r'TP2:\s*([\d\.]+)', tp)
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} 📝 Processing TP as string")
+        # Mencari TP2: di belakang 'TP2:' (cek substring dulu, lebih murah dari regex)
+        match = _TP2_RE.search(tp) if 'TP2:' in tp else None
         if match:
             try:
                 tp_val = float(match.group(1))
-                print(f"{LOG_PREFIX} ✅ Found TP2: {tp_val}")
+                if VERBOSE_LOGS:
+                    print(f"{LOG_PREFIX} ✅ Found TP2: {tp_val}")
             except ValueError as e:
                 print(f"{LOG_PREFIX} ❌ Failed to parse TP2: {e}")
                 pass
         
         # Fallback ke TP1
         if tp_val is None:
-            match = re.search(r'TP1:\s*([\d\.]+)', tp)
+            match = _TP1_RE.search(tp) if 'TP1:' in tp else None
             if match:
                 try:
                     tp_val = float(match.group(1))
-                    print(f"{LOG_PREFIX} ✅ Found TP1 (fallback): {tp_val}")
+                    if VERBOSE_LOGS:
+                        print(f"{LOG_PREFIX} ✅ Found TP1 (fallback): {tp_val}")
                 except ValueError as e:
                     print(f"{LOG_PREFIX} ❌ Failed to parse TP1: {e}")
                     pass
     else:
         try:
             tp_val = float(tp)
-            print(f"{LOG_PREFIX} ✅ Converted TP to float: {tp_val}")
+            if VERBOSE_LOGS:
+                print(f"{LOG_PREFIX} ✅ Converted TP to float: {tp_val}")
         except Exception as e:
             print(f"{LOG_PREFIX} ❌ Failed to convert TP to float: {e}")
             pass
     
     if tp_val is None:
-        print(f"{LOG_PREFIX} ⚠️ No valid TP value found")
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} ⚠️ No valid TP value found")
         return None
     
     reward = abs(tp_val - entry)
     rr = round(reward / risk, 2)
-    print(f"{LOG_PREFIX} ✅ RR calculated: {rr} (Risk: {risk:.6f}, Reward: {reward:.6f})")
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} ✅ RR calculated: {rr} (Risk: {risk:.6f}, Reward: {reward:.6f})")
     
     return rr
 
@@ -70,8 +87,13 @@ def format_price_dynamic(x):
     """
     Format angka dinamis berdasarkan besaran harga.
     """
+    # None is the normal "no value" input (e.g. missing stochastic), so answer
+    # it before the type check
+    if x is None:
+        return "-"
     if not isinstance(x, (float, int)):
-        print(f"{LOG_PREFIX} ⚠️ Invalid input type for format_price_dynamic: {type(x)}")
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} ⚠️ Invalid input type for format_price_dynamic: {type(x)}")
         return "-"
     
     x = float(x)
@@ -80,19 +102,23 @@ def format_price_dynamic(x):
     # 8 desimal untuk harga < 1
     if abs_x < 1:
         result = f"{x:.8f}".rstrip('0').rstrip('.')
-        print(f"{LOG_PREFIX} 💰 Formatted price < 1: {x} -> {result}")
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} 💰 Formatted price < 1: {x} -> {result}")
         return result
     # 4 desimal untuk harga 1 - 9.99
     if abs_x < 10:
         result = f"{x:.4f}"
-        print(f"{LOG_PREFIX} 💰 Formatted price 1-10: {x} -> {result}")
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} 💰 Formatted price 1-10: {x} -> {result}")
         return result
     # 3 desimal untuk harga 10 - 999.99
     if abs_x < 1000:
         result = f"{x:.3f}"
-        print(f"{LOG_PREFIX} 💰 Formatted price 10-1000: {x} -> {result}")
+        if VERBOSE_LOGS:
+            print(f"{LOG_PREFIX} 💰 Formatted price 10-1000: {x} -> {result}")
         return result
     # 2 desimal untuk harga >= 1000
     result = f"{x:.2f}"
-    print(f"{LOG_PREFIX} 💰 Formatted price >= 1000: {x} -> {result}")
+    if VERBOSE_LOGS:
+        print(f"{LOG_PREFIX} 💰 Formatted price >= 1000: {x} -> {result}")
     return result
\ No newline at end of file